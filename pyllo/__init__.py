@@ -14,11 +14,27 @@ warnings.filterwarnings(
     module="huggingface_hub.file_download",
 )
 
-from .cborg import cborg_models_as_csv, fetch_cborg_models
-from .config import Settings
-from .ingest import ingest_corpus
-from .minerals import collect_mineral_manuscripts
-from .rag import ClayRAG
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:  # pragma: no cover - imported for static analysis only
+    from .cborg import cborg_models_as_csv, fetch_cborg_models, write_cborg_models_csv
+    from .config import Settings
+    from .ingest import ingest_corpus
+    from .minerals import collect_mineral_manuscripts
+    from .rag import ClayRAG
+
+# Public names are resolved on first access (PEP 562) so that importing the package
+# does not pull in the embedding/LLM stack until it is actually needed.
+_LAZY_ATTRS = {
+    "Settings": ".config",
+    "ingest_corpus": ".ingest",
+    "collect_mineral_manuscripts": ".minerals",
+    "fetch_cborg_models": ".cborg",
+    "cborg_models_as_csv": ".cborg",
+    "write_cborg_models_csv": ".cborg",
+    "ClayRAG": ".rag",
+}
 
 __all__ = [
     "Settings",
@@ -26,5 +42,19 @@ __all__ = [
     "collect_mineral_manuscripts",
     "fetch_cborg_models",
     "cborg_models_as_csv",
+    "write_cborg_models_csv",
     "ClayRAG",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
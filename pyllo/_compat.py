@@ -0,0 +1,79 @@
+"""Small compatibility shims and file helpers shared across Pyllo modules."""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import os
+import sys
+import threading
+from contextlib import suppress
+from pathlib import Path
+from typing import Any, Optional
+
+try:  # Optional C-accelerated JSON.
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+# ``@dataclass(slots=True)`` needs Python 3.10+; older interpreters keep a ``__dict__``.
+DATACLASS_SLOTS: dict = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+def _json_default(obj: Any) -> Any:
+    # orjson serializes dataclasses natively; mirror that for the stdlib fallback.
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_dumps(obj: Any) -> bytes:
+    """Serialize *obj* to compact UTF-8 JSON bytes, with orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, default=_json_default, ensure_ascii=False, separators=(",", ":")).encode(
+        "utf-8"
+    )
+
+
+# Accepts ``bytes`` or ``str``; both decoders raise ``ValueError`` subclasses.
+json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Best-effort atomic write of *data* to *path*, creating parent directories.
+
+    The bytes go to a temp file unique to this process and thread and are then
+    ``os.replace``-d over *path*, so readers never see a partial file and concurrent
+    writers never share a temp file. Used for caches: ``OSError`` is swallowed.
+    """
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        # The cache is an optimization only; ignore unwritable locations.
+        with suppress(OSError):
+            tmp_path.unlink(missing_ok=True)
+
+
+class ShardedFileCache:
+    """On-disk store of one file per hex key, sharded by the key's first two characters."""
+
+    suffix = ""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}{self.suffix}"
+
+    def _read(self, key: str) -> Optional[bytes]:
+        try:
+            return self._path(key).read_bytes()
+        except OSError:
+            return None
+
+    def _write(self, key: str, data: bytes) -> None:
+        atomic_write_bytes(self._path(key), data)
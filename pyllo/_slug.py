@@ -0,0 +1,14 @@
+"""Shared slug helper for file and directory names."""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+
+@lru_cache(maxsize=16384)
+def slugify(value: str) -> str:
+    """Return a filesystem-friendly slug for the provided string."""
+    return _SLUG_RE.sub("-", value.lower()).strip("-")
@@ -0,0 +1,114 @@
+"""Request rate limiting shared by the threaded and asyncio download helpers."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing *rate_per_sec* calls with bursts up to *burst*."""
+
+    def __init__(self, rate_per_sec: float, burst: int = 1) -> None:
+        self.rate = rate_per_sec
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Take one token, sleeping until one is available."""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+
+
+class HostBuckets:
+    """Lazily created :class:`TokenBucket` per remote host, with optional overrides."""
+
+    def __init__(
+        self,
+        default_rate: float,
+        default_burst: int = 1,
+        overrides: Optional[Dict[str, TokenBucket]] = None,
+    ) -> None:
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self._buckets: Dict[str, TokenBucket] = dict(overrides or {})
+        self._lock = threading.Lock()
+
+    def for_url(self, url: str) -> TokenBucket:
+        host = (urlsplit(url).hostname or "").lower()
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.default_rate, self.default_burst)
+                self._buckets[host] = bucket
+            return bucket
+
+    def acquire(self, url: str) -> None:
+        self.for_url(url).acquire()
+
+
+class AsyncTokenBucket:
+    """Token bucket for coroutines on one event loop; waiters are served in arrival order."""
+
+    def __init__(self, rate_per_sec: float, burst: int = 1) -> None:
+        self.rate = rate_per_sec
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def acquire(self) -> None:
+        """Take one token, sleeping (without blocking the loop) until one is available."""
+        if self.rate <= 0:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AsyncHostBuckets:
+    """Lazily created :class:`AsyncTokenBucket` per remote host, with optional overrides."""
+
+    def __init__(
+        self,
+        default_rate: float,
+        default_burst: int = 1,
+        overrides: Optional[Dict[str, AsyncTokenBucket]] = None,
+    ) -> None:
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self._buckets: Dict[str, AsyncTokenBucket] = dict(overrides or {})
+
+    def for_url(self, url: str) -> AsyncTokenBucket:
+        host = (urlsplit(url).hostname or "").lower()
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = AsyncTokenBucket(self.default_rate, self.default_burst)
+            self._buckets[host] = bucket
+        return bucket
+
+    async def acquire(self, url: str) -> None:
+        await self.for_url(url).acquire()
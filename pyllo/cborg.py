@@ -2,18 +2,37 @@
 
 from __future__ import annotations
 
-import csv
-from dataclasses import dataclass, field
-from io import StringIO
-from typing import Iterable, List
+import time
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import IO, Iterable, Iterator, List, Optional, TextIO, Tuple
 
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree
+
+from ._compat import DATACLASS_SLOTS, atomic_write_bytes, json_dumps, json_loads
 
 CBORG_MODELS_URL = "https://cborg.lbl.gov/models/"
+CBORG_CACHE_PATH = Path.home() / ".cache" / "pyllo" / "cborg_models.json"
+CBORG_CACHE_TTL = 3600.0
 
+API_NAME_LABEL = "API Model Name"
+TABLE_HEADERS = [
+    "Model Endpoint Location",
+    "Model Creator",
+    "Model Name",
+    "Context Length*",
+    "Vision",
+    "Cost**",
+    "Security Level",
+]
 
-@dataclass
+# Match csv.writer's default dialect so the output is unchanged.
+_CSV_LINE_TERMINATOR = "\r\n"
+_CSV_SPECIAL_CHARS = frozenset(',"\r\n')
+
+
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class CBORGModel:
     endpoint: str
     creator: str
@@ -22,64 +41,61 @@ class CBORGModel:
     vision: str
     cost: str
     security: str
-    api_names: List[str] = field(default_factory=list)
+    api_names: Tuple[str, ...] = ()
 
 
-def _extract_api_name_map(soup: BeautifulSoup) -> dict[str, List[str]]:
-    mapping: dict[str, List[str]] = {}
-    for strong in soup.find_all("strong"):
-        if "API Model Name" not in strong.get_text(strip=True):
-            continue
-        header = strong.find_previous(["h2", "h3", "h4"])
-        if not header:
-            continue
-        key = header.get_text(strip=True).lower()
-        codes = [code.get_text(strip=True) for code in strong.parent.find_all("code")]
-        if not codes:
-            text = strong.parent.get_text(" ", strip=True)
-            suffix = text.split("API Model Name", 1)[-1]
-            codes = [item.strip(" ,") for item in suffix.split(",") if item.strip()]
-        if not codes:
-            continue
-        existing = mapping.setdefault(key, [])
-        for code in codes:
-            if code not in existing:
-                existing.append(code)
-    return mapping
+@dataclass
+class _CacheEntry:
+    """Parsed listing for one URL plus the HTTP validators it was served with."""
 
+    fetched_at: float
+    models: List[CBORGModel]
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
 
-def fetch_cborg_models(url: str = CBORG_MODELS_URL) -> List[CBORGModel]:
-    """Fetch the CBORG models table and return a list of CBORGModel entries."""
 
-    resp = requests.get(url, timeout=30)
-    resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
-    api_map = _extract_api_name_map(soup)
+# In-process memo of parsed listings keyed by URL.
+_MODELS_CACHE: dict[str, _CacheEntry] = {}
+
+
+def _stripped_text(node: etree._Element) -> str:
+    """Concatenate the stripped text fragments of *node* (like ``get_text(strip=True)``)."""
+    return "".join(piece.strip() for piece in node.itertext())
+
+
+# Whitespace-normalized text of a node, accumulated by libxml2 rather than in Python.
+_normalized_text = etree.XPath("normalize-space()", smart_strings=False)
+_row_cells = etree.XPath("./td")
 
-    models: List[CBORGModel] = []
-    tables = soup.find_all("table")
-    expected = [
-        "Model Endpoint Location",
-        "Model Creator",
-        "Model Name",
-        "Context Length*",
-        "Vision",
-        "Cost**",
-        "Security Level",
-    ]
-    for table in tables:
-        headers = [th.get_text(strip=True) for th in table.find_all("th")]
-        if headers[: len(expected)] != expected:
-            continue
 
-        tbody = table.find("tbody")
-        if not tbody:
+def _add_api_names(mapping: dict[str, List[str]], key: str, parent: etree._Element) -> None:
+    codes = [_stripped_text(code) for code in parent.iterdescendants("code")]
+    if not codes:
+        suffix = _normalized_text(parent).split(API_NAME_LABEL, 1)[-1]
+        codes = [item.strip(" ,") for item in suffix.split(",") if item.strip()]
+    if not codes:
+        return
+    existing = mapping.setdefault(key, [])
+    for code in codes:
+        if code not in existing:
+            existing.append(code)
+
+
+def _table_models(table: etree._Element) -> List[CBORGModel]:
+    headers = [_stripped_text(th) for th in table.iterdescendants("th")]
+    if headers[: len(TABLE_HEADERS)] != TABLE_HEADERS:
+        return []
+
+    tbody = table.find(".//tbody")
+    if tbody is None:
+        return []
+    models: List[CBORGModel] = []
+    for row in tbody.iterdescendants("tr"):
+        cells = [_normalized_text(td) for td in _row_cells(row)]
+        if len(cells) < len(TABLE_HEADERS):
             continue
-        for row in tbody.find_all("tr"):
-            cells = [td.get_text(strip=True) for td in row.find_all("td")]
-            if len(cells) < len(expected):
-                continue
-            model = CBORGModel(
+        models.append(
+            CBORGModel(
                 endpoint=cells[0],
                 creator=cells[1],
                 name=cells[2],
@@ -88,40 +104,238 @@ def fetch_cborg_models(url: str = CBORG_MODELS_URL) -> List[CBORGModel]:
                 cost=cells[5],
                 security=cells[6],
             )
-            key_candidates = {
-                model.name.lower(),
-                f"{model.creator} {model.name}".lower(),
-            }
-            api_names: List[str] = []
-            for key, codes in api_map.items():
-                if any(candidate in key for candidate in key_candidates) or any(
-                    key in candidate for candidate in key_candidates
-                ):
-                    api_names.extend(codes)
-            model.api_names = sorted(set(api_names))
-            models.append(model)
+        )
     return models
 
 
-def cborg_models_as_csv(models: Iterable[CBORGModel]) -> str:
-    """Render CBORG model entries to CSV string."""
+NGRAM_SIZE = 3
+
+
+def _ngrams(text: str) -> set[str]:
+    return {text[i : i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+@dataclass
+class _NgramIndex:
+    """Character n-gram postings for the API map keys.
+
+    Whenever one string contains another of at least ``NGRAM_SIZE`` characters, the
+    two share an n-gram. So any key that passes the substring test in either
+    direction either shares an n-gram with a candidate or is too short to have
+    n-grams. The index therefore never misses a match the exhaustive scan would find.
+    """
+
+    postings: dict[str, List[str]]
+    short_keys: List[str]
+    all_keys: List[str]
+
+    def candidates(self, texts: Iterable[str]) -> set[str]:
+        texts = list(texts)
+        if any(len(text) < NGRAM_SIZE for text in texts):
+            return set(self.all_keys)
+        keys = set(self.short_keys)
+        for text in texts:
+            for gram in _ngrams(text):
+                keys.update(self.postings.get(gram, ()))
+        return keys
+
+
+def _build_ngram_index(api_map: dict[str, List[str]]) -> _NgramIndex:
+    postings: dict[str, List[str]] = {}
+    short_keys: List[str] = []
+    for key in api_map:
+        grams = _ngrams(key)
+        if not grams:
+            short_keys.append(key)
+        for gram in grams:
+            postings.setdefault(gram, []).append(key)
+    return _NgramIndex(postings=postings, short_keys=short_keys, all_keys=list(api_map))
+
+
+def _match_api_names(
+    model: CBORGModel, api_map: dict[str, List[str]], index: _NgramIndex
+) -> Tuple[str, ...]:
+    key_candidates = {
+        model.name.lower(),
+        f"{model.creator} {model.name}".lower(),
+    }
+
+    api_names: List[str] = []
+    for key in index.candidates(key_candidates):
+        if any(candidate in key for candidate in key_candidates) or any(
+            key in candidate for candidate in key_candidates
+        ):
+            api_names.extend(api_map[key])
+    return tuple(sorted(set(api_names)))
+
+
+def _parse_models_page(source: IO[bytes]) -> List[CBORGModel]:
+    """Parse the models page from a byte stream in a single incremental pass.
 
-    output = StringIO()
-    writer = csv.writer(output)
-    writer.writerow(
-        ["Endpoint", "Creator", "Model", "API Names", "Context", "Vision", "Cost", "Security"]
-    )
+    API-name labels are keyed by the most recent ``h2``-``h4`` heading and resolved
+    once their enclosing element closes; tables are converted to models as soon as
+    they close and then released to keep the partial tree small.
+    """
+
+    api_map: dict[str, List[str]] = {}
+    models: List[CBORGModel] = []
+    heading: Optional[str] = None
+    pending: dict[etree._Element, str] = {}
+
+    for _, elem in etree.iterparse(source, events=("end",), html=True):
+        tag = elem.tag
+        if tag in ("h2", "h3", "h4"):
+            heading = _stripped_text(elem).lower()
+        elif tag == "strong":
+            parent = elem.getparent()
+            if heading is not None and parent is not None:
+                if API_NAME_LABEL in _normalized_text(elem):
+                    pending.setdefault(parent, heading)
+        elif tag == "table":
+            models.extend(_table_models(elem))
+            elem.clear()
+            # Labels still waiting on an ancestor may need earlier siblings.
+            if not pending:
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+
+        if elem in pending:
+            _add_api_names(api_map, pending.pop(elem), elem)
+
+    index = _build_ngram_index(api_map)
+    return [replace(model, api_names=_match_api_names(model, api_map, index)) for model in models]
+
+
+def clear_cache() -> None:
+    """Drop the in-process CBORG model cache (the on-disk cache is left untouched)."""
+    _MODELS_CACHE.clear()
+
+
+def _read_cache(cache_path: Path, url: str) -> Optional[_CacheEntry]:
+    try:
+        payload = json_loads(cache_path.read_bytes())
+        entry = payload[url]
+        return _CacheEntry(
+            fetched_at=float(entry["fetched_at"]),
+            models=[
+                CBORGModel(**{**item, "api_names": tuple(item.get("api_names") or ())})
+                for item in entry["models"]
+            ],
+            etag=entry.get("etag"),
+            last_modified=entry.get("last_modified"),
+        )
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def _write_cache(cache_path: Path, url: str, entry: _CacheEntry) -> None:
+    try:
+        payload = json_loads(cache_path.read_bytes())
+        if not isinstance(payload, dict):
+            payload = {}
+    except (OSError, ValueError):
+        payload = {}
+    payload[url] = entry
+
+    atomic_write_bytes(cache_path, json_dumps(payload))
+
+
+def _lookup_cache(cache_path: Path, url: str, ttl: float) -> Optional[_CacheEntry]:
+    """Return the freshest known entry for *url*, preferring the in-process copy."""
+    entry = _MODELS_CACHE.get(url)
+    if entry is None or time.time() - entry.fetched_at >= ttl:
+        disk_entry = _read_cache(cache_path, url)
+        if disk_entry is not None and (entry is None or disk_entry.fetched_at > entry.fetched_at):
+            entry = disk_entry
+    return entry
+
+
+def fetch_cborg_models(
+    url: str = CBORG_MODELS_URL,
+    *,
+    ttl: float = CBORG_CACHE_TTL,
+    force_refresh: bool = False,
+    cache_path: Optional[Path] = None,
+) -> List[CBORGModel]:
+    """Fetch the CBORG models table and return a list of CBORGModel entries.
+
+    Results are cached per URL for *ttl* seconds, both in-process and on disk
+    (``~/.cache/pyllo/cborg_models.json`` by default). Once an entry expires the page
+    is revalidated with ``If-None-Match``/``If-Modified-Since`` and a ``304`` reply
+    reuses the cached models without reparsing. Pass ``force_refresh=True`` to
+    bypass both caches and refetch unconditionally.
+    """
+
+    cache_path = cache_path or CBORG_CACHE_PATH
+    entry = None if force_refresh else _lookup_cache(cache_path, url, ttl)
+    if entry is not None and time.time() - entry.fetched_at < ttl:
+        _MODELS_CACHE[url] = entry
+        return list(entry.models)
+
+    headers = {}
+    if entry is not None:
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+
+    with requests.get(url, headers=headers, timeout=30, stream=True) as resp:
+        if resp.status_code == 304 and entry is not None:
+            entry = replace(entry, fetched_at=time.time())
+        else:
+            resp.raise_for_status()
+            resp.raw.decode_content = True
+            models = _parse_models_page(resp.raw)
+            entry = _CacheEntry(
+                fetched_at=time.time(),
+                models=models,
+                etag=resp.headers.get("ETag"),
+                last_modified=resp.headers.get("Last-Modified"),
+            )
+
+    _MODELS_CACHE[url] = entry
+    _write_cache(cache_path, url, entry)
+    return list(entry.models)
+
+
+def _csv_field(value: str) -> str:
+    """Quote *value* the way ``csv.QUOTE_MINIMAL`` would."""
+    if any(char in value for char in _CSV_SPECIAL_CHARS):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def _csv_lines(models: Iterable[CBORGModel]) -> Iterator[str]:
+    yield "Endpoint,Creator,Model,API Names,Context,Vision,Cost,Security"
     for model in models:
-        writer.writerow(
-            [
-                model.endpoint,
-                model.creator,
-                model.name,
-                "; ".join(model.api_names) if model.api_names else "",
-                model.context,
-                model.vision,
-                model.cost,
-                model.security,
-            ]
+        fields = (
+            model.endpoint,
+            model.creator,
+            model.name,
+            "; ".join(model.api_names) if model.api_names else "",
+            model.context,
+            model.vision,
+            model.cost,
+            model.security,
         )
-    return output.getvalue()
+        yield ",".join(_csv_field(value) for value in fields)
+
+
+def cborg_models_as_csv(models: Iterable[CBORGModel]) -> str:
+    """Render CBORG model entries to CSV string."""
+
+    rows = list(_csv_lines(models))
+    rows.append("")
+    return _CSV_LINE_TERMINATOR.join(rows)
+
+
+def write_cborg_models_csv(models: Iterable[CBORGModel], dest: Path | TextIO) -> None:
+    """Stream CBORG model entries as CSV to *dest* (a path or an open text file)."""
+
+    if isinstance(dest, (str, Path)):
+        with open(dest, "w", newline="", buffering=65536, encoding="utf-8") as fp:
+            write_cborg_models_csv(models, fp)
+        return
+    for line in _csv_lines(models):
+        dest.write(line)
+        dest.write(_CSV_LINE_TERMINATOR)
@@ -3,46 +3,52 @@
 from __future__ import annotations
 
 import re
+from collections import ChainMap
 from dataclasses import dataclass
-from typing import Iterable, List, Optional
+from typing import Any, Iterable, List, Mapping, Optional
+
+from ._compat import DATACLASS_SLOTS
 
 HEADING_PATTERN = re.compile(r"^\s*((\d+(\.\d+)*)|[A-Z][A-Z\s]{2,})[\.\)]?\s")
+# HEADING_PATTERN applied to every line of a multi-line string at once; whitespace
+# classes exclude newlines so a match never spans more than one line.
+HEADING_LINE_PATTERN = re.compile(
+    r"^[^\S\n]*((\d+(\.\d+)*)|[A-Z](?:[A-Z]|[^\S\n]){2,})[\.\)]?[^\S\n]", re.MULTILINE
+)
+INLINE_WHITESPACE_PATTERN = re.compile(r"[ \t]+")
+BLANK_LINES_PATTERN = re.compile(r"\n{3,}")
+WORD_PATTERN = re.compile(r"\S+")
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class TextChunk:
     """Represents a chunk of processed text ready for embedding."""
 
     content: str
     source_id: str
     chunk_id: str
-    metadata: dict
+    metadata: Mapping[str, Any]
+
+    def full_metadata(self) -> dict:
+        """Return the chunk metadata materialized as a plain dict."""
+        return dict(self.metadata)
 
 
 def clean_text(text: str) -> str:
     """Lightly normalize whitespace and remove spurious artefacts."""
     text = text.replace("\x0c", "\n")
-    text = re.sub(r"[ \t]+", " ", text)
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = INLINE_WHITESPACE_PATTERN.sub(" ", text)
+    text = BLANK_LINES_PATTERN.sub("\n\n", text)
     return text.strip()
 
 
 def split_by_headings(text: str) -> List[str]:
     """Split on headings when possible to keep semantic context together."""
-    lines = text.splitlines()
-    sections: List[str] = []
-    buffer: List[str] = []
-
-    def flush():
-        if buffer:
-            sections.append("\n".join(buffer).strip())
-            buffer.clear()
-
-    for line in lines:
-        if HEADING_PATTERN.match(line) and buffer:
-            flush()
-        buffer.append(line)
-    flush()
+    starts = [match.start() for match in HEADING_LINE_PATTERN.finditer(text)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    bounds = zip(starts, starts[1:] + [len(text)])
+    sections = (text[start:end].strip() for start, end in bounds)
     return [s for s in sections if s]
 
 
@@ -53,31 +59,39 @@ def chunk_text(
     target_tokens: int = 500,
     overlap_tokens: int = 75,
 ) -> Iterable[TextChunk]:
-    """Split text into overlapping chunks ready for embedding."""
+    """Split text into overlapping chunks ready for embedding.
+
+    Each chunk's ``metadata`` is a ``ChainMap`` of its per-chunk fields over the shared
+    *base_metadata* mapping, which is referenced rather than copied per chunk.
+    """
     base_metadata = base_metadata or {}
     sections = split_by_headings(clean_text(text))
     if not sections:
         sections = [clean_text(text)]
 
     chunk_idx = 0
+    stride = max(target_tokens - overlap_tokens, 1)
     for section in sections:
-        words = section.split()
+        spans = [match.span() for match in WORD_PATTERN.finditer(section)]
+        if not spans:
+            continue
+        section_title = base_metadata.get("section_title", section[spans[0][0] : spans[0][1]])
         start = 0
-        stride = max(target_tokens - overlap_tokens, 1)
-        while start < len(words):
-            end = min(start + target_tokens, len(words))
-            chunk_words = words[start:end]
-            chunk_text = " ".join(chunk_words)
-            if not chunk_text.strip():
-                break
-
-            metadata = dict(base_metadata)
-            metadata["section_start_word"] = start
-            metadata["section_end_word"] = end
-            metadata.setdefault("section_title", words[0] if words else "")
+        while start < len(spans):
+            end = min(start + target_tokens, len(spans))
+            content = section[spans[start][0] : spans[end - 1][1]]
+
+            metadata = ChainMap(
+                {
+                    "section_start_word": start,
+                    "section_end_word": end,
+                    "section_title": section_title,
+                },
+                base_metadata,
+            )
 
             yield TextChunk(
-                content=chunk_text,
+                content=content,
                 source_id=source_id,
                 chunk_id=f"{source_id}::chunk-{chunk_idx}",
                 metadata=metadata,
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from pathlib import Path
 from typing import List
 
@@ -9,12 +10,7 @@ import typer
 from rich.console import Console
 from rich.table import Table
 
-from .cborg import fetch_cborg_models
 from .config import Settings
-from .ingest import ingest_corpus
-from .minerals import collect_mineral_manuscripts
-from .rag import ClayRAG
-from .structures import StructureDownloaderError, gather_structures
 
 app = typer.Typer(help="Pyllo CLI: clay-science retrieval augmented generation toolkit.")
 console = Console()
@@ -26,6 +22,8 @@ def ingest(
     corpus_dir: Path = typer.Option(None, help="Override literature directory containing PDFs."),
 ) -> None:
     """Ingest PDFs into the local vector store."""
+    from .ingest import ingest_corpus
+
     settings = Settings()
     if data_dir:
         settings.data_dir = data_dir
@@ -45,8 +43,11 @@ def query(
     question: str = typer.Argument(..., help="Clay-science question to send to the RAG assistant."),
     top_k: int = typer.Option(None, help="Override number of retrieved chunks."),
     show_context: bool = typer.Option(True, help="Display supporting context after the answer."),
+    stream: bool = typer.Option(False, help="Print the answer incrementally as it is generated."),
 ) -> None:
     """Ask the Pyllo RAG assistant a question."""
+    from .rag import ClayRAG
+
     settings = Settings()
     try:
         rag = ClayRAG(settings)
@@ -60,14 +61,23 @@ def query(
     if top_k:
         rag.retriever.retriever_config.top_k = top_k
 
-    response = rag.answer(question)
-    console.print(f"[bold green]Answer:[/bold green] {response.answer}\n")
+    if stream:
+        answer_stream = rag.answer_stream(question)
+        console.print("[bold green]Answer:[/bold green] ", end="")
+        for delta in answer_stream:
+            console.print(delta, end="", markup=False, highlight=False, soft_wrap=True)
+        console.print("\n")
+        context = answer_stream.context
+    else:
+        response = rag.answer(question)
+        console.print(f"[bold green]Answer:[/bold green] {response.answer}\n")
+        context = response.context
 
     if show_context:
         table = Table(title="Retrieved Context", show_header=True, header_style="bold magenta")
         table.add_column("Citation", style="cyan", justify="left")
         table.add_column("Preview", style="white", justify="left")
-        for ctx in response.context:
+        for ctx in context:
             if "\n" in ctx:
                 citation, content = ctx.split("\n", 1)
             else:
@@ -94,10 +104,15 @@ def minerals_download(
     ),
     sleep_seconds: float = typer.Option(1.0, help="Delay between Crossref requests."),
     dry_run: bool = typer.Option(False, help="Only gather metadata without downloading PDFs."),
+    workers: int = typer.Option(8, help="Threads used for Crossref searches and downloads."),
+    use_async: bool = typer.Option(
+        False,
+        "--async",
+        help="Use the asyncio collector; --workers then caps the minerals in flight.",
+    ),
 ) -> None:
     """Collect manuscripts for IMA minerals and download available PDFs."""
-
-    results = collect_mineral_manuscripts(
+    options = dict(
         minerals=minerals,
         mineral_dir=mineral_dir,
         output_dir=output_dir,
@@ -106,6 +121,14 @@ def minerals_download(
         sleep_seconds=sleep_seconds,
         download=not dry_run,
     )
+    if use_async:
+        from .minerals_async import acollect_mineral_manuscripts
+
+        results = asyncio.run(acollect_mineral_manuscripts(**options, max_concurrency=workers))
+    else:
+        from .minerals import collect_mineral_manuscripts
+
+        results = collect_mineral_manuscripts(**options, max_workers=workers)
 
     unique_minerals = {item.mineral for item in results}
     console.print(
@@ -115,11 +138,13 @@ def minerals_download(
 
 @app.command("cborg-models")
 def cborg_models(
-    show_details: bool = typer.Option(False, help="Include additional columns in the listing.")
+    show_details: bool = typer.Option(False, help="Include additional columns in the listing."),
+    refresh: bool = typer.Option(False, help="Ignore the cached model list and refetch it."),
 ) -> None:
     """Print the list of CBORG models available via the OpenAI-compatible endpoint."""
+    from .cborg import fetch_cborg_models
 
-    models = fetch_cborg_models()
+    models = fetch_cborg_models(force_refresh=refresh)
     if not models:
         console.print(
             "[yellow]No CBORG models found. Check https://cborg.lbl.gov/models/ "
@@ -177,9 +202,11 @@ def structures_download(
         "-k",
         help="Materials Project API key (falls back to MAPI_KEY env var).",
     ),
-    sleep_seconds: float = typer.Option(0.5, help="Delay between HTTP requests."),
+    sleep_seconds: float = typer.Option(0.5, help="Delay between HTTP requests to each host."),
+    concurrency: int = typer.Option(8, help="Number of minerals to process concurrently."),
 ) -> None:
     """Download experimental (RRUFF) and simulated (Materials Project) CIFs into data/structure."""
+    from .structures import StructureDownloaderError, gather_structures_async
 
     if not csv_path:
         minerals_dir = Path("data/minerals")
@@ -193,16 +220,19 @@ def structures_download(
         csv_path = matches[-1]
 
     try:
-        results = gather_structures(
-            csv_path=csv_path,
-            base_dir=Path("data"),
-            minerals=minerals,
-            limit=limit or None,
-            include_experimental=not skip_experimental,
-            include_simulated=not skip_simulated,
-            api_key=api_key,
-            sleep_seconds=sleep_seconds,
-            console=console,
+        results = asyncio.run(
+            gather_structures_async(
+                csv_path=csv_path,
+                base_dir=Path("data"),
+                minerals=minerals,
+                limit=limit or None,
+                include_experimental=not skip_experimental,
+                include_simulated=not skip_simulated,
+                api_key=api_key,
+                sleep_seconds=sleep_seconds,
+                max_concurrency=concurrency,
+                console=console,
+            )
         )
     except StructureDownloaderError as exc:
         console.print(f"[red]{exc}[/red]")
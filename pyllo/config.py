@@ -25,6 +25,24 @@ class ModelConfig(BaseModel):
         description="Environment variable that stores the API key for the selected provider.",
     )
     request_timeout: float = Field(default=60.0, gt=0)
+    connect_timeout: float = Field(default=10.0, gt=0)
+    max_connections: int = Field(
+        default=512, gt=0, description="Upper bound on pooled HTTP connections to the provider."
+    )
+    max_keepalive_connections: int = Field(
+        default=256, gt=0, description="Idle connections kept open for reuse."
+    )
+    batch_size: int = Field(
+        default=16, gt=0, description="Requests kept in flight by ClayGenerator.generate_batch."
+    )
+    answer_cache: bool = Field(
+        default=True,
+        description="Reuse stored answers for identical (model, prompt, context) requests.",
+    )
+    prewarm: bool = Field(
+        default=True,
+        description="Open the provider connection in the background when the generator starts.",
+    )
 
     model_config = ConfigDict(protected_namespaces=())
 
@@ -33,7 +51,12 @@ class EmbeddingConfig(BaseModel):
     """Embedding model configuration."""
 
     model_name: str = Field(default="sentence-transformers/all-MiniLM-L6-v2")
-    batch_size: int = Field(default=16, gt=0)
+    batch_size: int = Field(default=64, gt=0)
+    workers: int = Field(
+        default=2,
+        gt=0,
+        description="Concurrent encode calls during ingestion; overlaps tokenization with compute.",
+    )
     device: Optional[str] = Field(
         default=None, description="Torch device override, e.g. 'cpu' or 'cuda'."
     )
@@ -45,6 +68,9 @@ class RetrieverConfig(BaseModel):
     """Retriever behavior configuration."""
 
     top_k: int = Field(default=5, gt=0)
+    query_cache_size: int = Field(
+        default=1024, ge=0, description="Query embeddings kept for reuse; 0 disables the cache."
+    )
     reranker_model: Optional[str] = Field(
         default=None,
         description=(
@@ -65,6 +91,11 @@ class Settings(BaseSettings):
     corpus_dirs: List[Path] = Field(default_factory=lambda: [DEFAULT_LITERATURE_DIR])
     metadata_path: Path = Field(default=DEFAULT_METADATA_PATH)
     cache_dir: Optional[Path] = None
+    ingest_workers: Optional[int] = Field(
+        default=None,
+        gt=0,
+        description="Processes used for PDF text extraction; defaults to the CPU count.",
+    )
 
     model: ModelConfig = Field(default_factory=ModelConfig)
     embedding: EmbeddingConfig = Field(default_factory=EmbeddingConfig)
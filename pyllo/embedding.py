@@ -2,26 +2,120 @@
 
 from __future__ import annotations
 
+import hashlib
+import io
 from functools import lru_cache
-from typing import Iterable
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Optional, Sequence
 
 import numpy as np
 from sentence_transformers import SentenceTransformer
 
+from ._compat import ShardedFileCache
 from .config import EmbeddingConfig
 
+# When texts arrive as a lazy iterable, encode them this many batches at a time so the
+# full list of strings never has to be materialized.
+STREAM_BATCHES = 8
 
-@lru_cache(maxsize=1)
+
+@lru_cache(maxsize=4)
 def load_model(config_tuple: tuple) -> SentenceTransformer:
-    """Load and cache the embedding model."""
+    """Load and cache the embedding model keyed by ``(model_name, device)``."""
     model_name, device = config_tuple
-    return SentenceTransformer(model_name, device=device or "cpu")
+    model = SentenceTransformer(model_name, device=device or "cpu")
+    if str(model.device).startswith("cuda"):
+        # Half precision halves memory traffic on GPU; outputs are upcast for FAISS.
+        model.half()
+    return model
+
+
+def get_embedding_model(config: EmbeddingConfig) -> SentenceTransformer:
+    """Return the cached model for *config*.
+
+    ``EmbeddingConfig`` is not hashable, so the cache is keyed on its
+    ``(model_name, device)`` pair; changing other fields at runtime never reloads the
+    model, and changing either of these loads (and caches) a new one.
+    """
+    return load_model((config.model_name, config.device))
+
 
+def embedding_dimension(config: EmbeddingConfig) -> int:
+    """Return the vector width produced by the configured model."""
+    return int(get_embedding_model(config).get_sentence_embedding_dimension())
 
-def embed_texts(texts: Iterable[str], config: EmbeddingConfig) -> np.ndarray:
-    """Encode a list of texts into a numpy matrix."""
-    model = load_model((config.model_name, config.device))
+
+def _encode(
+    model: SentenceTransformer,
+    texts: Sequence[str],
+    batch_size: int,
+    show_progress_bar: bool = True,
+) -> np.ndarray:
     embeddings = model.encode(
-        list(texts), batch_size=config.batch_size, convert_to_numpy=True, show_progress_bar=True
+        texts,
+        batch_size=batch_size,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+        show_progress_bar=show_progress_bar,
     )
-    return embeddings.astype("float32")
+    return embeddings.astype("float32", copy=False)
+
+
+def embed_texts(
+    texts: Iterable[str], config: EmbeddingConfig, *, show_progress_bar: bool = True
+) -> np.ndarray:
+    """Encode a list of texts into a numpy matrix of L2-normalized float32 rows."""
+    model = get_embedding_model(config)
+    if isinstance(texts, Sequence):
+        return _encode(model, texts, config.batch_size, show_progress_bar)
+
+    iterator = iter(texts)
+    slice_size = config.batch_size * STREAM_BATCHES
+    parts = []
+    while True:
+        batch = list(islice(iterator, slice_size))
+        if not batch:
+            break
+        parts.append(_encode(model, batch, config.batch_size, show_progress_bar))
+    if not parts:
+        return _encode(model, [], config.batch_size, show_progress_bar)
+    return np.concatenate(parts) if len(parts) > 1 else parts[0]
+
+
+class EmbeddingCache(ShardedFileCache):
+    """On-disk store of per-document embedding matrices (one ``.npy`` file per key).
+
+    Keys combine the embedding model, the document hash and the chunk texts, so a
+    changed PDF, chunking setup or model never reuses stale vectors.
+    """
+
+    suffix = ".npy"
+
+    def __init__(self, directory: Path, model_name: str) -> None:
+        super().__init__(directory)
+        self.model_name = model_name
+
+    def key(self, sha256: str, texts: Iterable[str]) -> str:
+        h = hashlib.sha256(f"{self.model_name}\0{sha256}".encode("utf-8"))
+        for index, text in enumerate(texts):
+            h.update(f"\0{index}\0".encode("ascii"))
+            h.update(text.encode("utf-8"))
+        return h.hexdigest()
+
+    def get(self, key: str, rows: int) -> Optional[np.ndarray]:
+        data = self._read(key)
+        if data is None:
+            return None
+        try:
+            embeddings = np.load(io.BytesIO(data), allow_pickle=False)
+        except ValueError:
+            return None
+        if embeddings.ndim != 2 or embeddings.shape[0] != rows:
+            return None
+        return embeddings.astype("float32", copy=False)
+
+    def put(self, key: str, embeddings: np.ndarray) -> None:
+        buffer = io.BytesIO()
+        np.save(buffer, embeddings, allow_pickle=False)
+        self._write(key, buffer.getvalue())
@@ -2,13 +2,21 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import os
+import threading
 from dataclasses import dataclass
-from typing import Iterable, List, Optional
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
 
-from litellm import completion
-from openai import OpenAI
+import httpx
+from litellm import acompletion, completion
+from openai import AsyncOpenAI, OpenAI
 
+from ._compat import ShardedFileCache
 from .config import ModelConfig
 from .retriever import RetrievedChunk
 
@@ -22,14 +30,27 @@ SYSTEM_PROMPT = (
 )
 
 
+_CONTEXT_PART = "Context:\n{}\n\n".format
+_QUESTION_PART = (
+    "Question:\n{}\n\nCompose a detailed answer as Pyllo. Cite sources using [AuthorYear] tags."
+).format
+_CONTEXT_FORMAT = "[{}] Score={:.3f}\n{}".format
+
+
+def _format_context(item: RetrievedChunk) -> str:
+    record = item.record
+    meta = record.metadata
+    citation = meta.get("citation") or meta.get("source_id") or record.source_id
+    return _CONTEXT_FORMAT(citation, item.score, record.content)
+
+
 def build_context(chunks: Iterable[RetrievedChunk]) -> List[str]:
-    """Format retrieved chunks into context strings with citations."""
-    formatted = []
-    for item in chunks:
-        meta = item.record.metadata
-        citation = meta.get("citation") or meta.get("source_id") or item.record.source_id
-        formatted.append(f"[{citation}] Score={item.score:.3f}\n{item.record.content.strip()}")
-    return formatted
+    """Format retrieved chunks into context strings with citations.
+
+    Chunk content is stored already trimmed (``chunk_text`` slices from the first to
+    the last word of each window), so no per-chunk ``strip`` is needed here.
+    """
+    return list(map(_format_context, chunks))
 
 
 @dataclass
@@ -38,64 +59,56 @@ class GenerationResult:
     context: List[str]
 
 
+_ANSWER_KEYS = ("output_text", "final_answer", "answer")
+_TEXT_TYPES = frozenset({"output_text", "final_answer", "answer", "text"})
+_NESTED_KEYS = (
+    "steps",
+    "segments",
+    "content",
+    "parts",
+    "messages",
+    "items",
+    "choices",
+    "reasoning",
+)
+
+
 def _collect_text_fragments(value: object, *, allow_reasoning_text: bool = False) -> List[str]:
-    """Recursively gather textual fragments from OpenAI response structures."""
+    """Gather textual fragments from OpenAI response structures (depth-first, in order)."""
 
     fragments: List[str] = []
     seen: set[str] = set()
+    stack: List[Tuple[object, bool]] = [(value, allow_reasoning_text)]
 
-    def add(text: str) -> None:
-        cleaned = text.strip()
-        if cleaned and cleaned not in seen:
-            seen.add(cleaned)
-            fragments.append(cleaned)
-
-    def visit(obj: object, allow_free_text: bool) -> None:
+    while stack:
+        obj, allow_free_text = stack.pop()
         if obj is None:
-            return
+            continue
         if isinstance(obj, str):
-            add(obj)
-            return
-        if isinstance(obj, dict):
-            obj_type = obj.get("type")
-            candidate_keys = ("output_text", "final_answer", "answer")
-            found_candidate = False
-            for key in candidate_keys:
-                if key in obj:
-                    found_candidate = True
-                    visit(obj[key], allow_free_text=False)
-            if found_candidate:
-                return
-
-            text_value = obj.get("text")
-            if isinstance(text_value, (str, list, dict)):
-                if allow_free_text or obj_type in {"output_text", "final_answer", "answer", "text"}:
-                    visit(text_value, allow_free_text=False)
-
-            value_field = obj.get("value")
-            if isinstance(value_field, (str, list, dict)):
-                if allow_free_text or obj_type in {"output_text", "final_answer", "answer", "text"}:
-                    visit(value_field, allow_free_text=False)
-
-            nested_keys = (
-                "steps",
-                "segments",
-                "content",
-                "parts",
-                "messages",
-                "items",
-                "choices",
-                "reasoning",
-            )
-            for key in nested_keys:
-                if key in obj:
-                    visit(obj[key], allow_free_text=True)
-            return
+            cleaned = obj.strip()
+            if cleaned and cleaned not in seen:
+                seen.add(cleaned)
+                fragments.append(cleaned)
+            continue
         if isinstance(obj, list):
-            for item in obj:
-                visit(item, allow_free_text=allow_free_text)
+            stack.extend((item, allow_free_text) for item in reversed(obj))
+            continue
+        if not isinstance(obj, dict):
+            continue
+
+        # Children are collected in visiting order, then pushed reversed onto the stack.
+        children: List[Tuple[object, bool]] = [
+            (obj[key], False) for key in _ANSWER_KEYS if key in obj
+        ]
+        if not children:
+            if allow_free_text or obj.get("type") in _TEXT_TYPES:
+                for field_name in ("text", "value"):
+                    field_value = obj.get(field_name)
+                    if isinstance(field_value, (str, list, dict)):
+                        children.append((field_value, False))
+            children.extend((obj[key], True) for key in _NESTED_KEYS if key in obj)
+        stack.extend(reversed(children))
 
-    visit(value, allow_free_text=allow_reasoning_text)
     return fragments
 
 
@@ -107,11 +120,21 @@ def _extract_text_from_reasoning(reasoning: object) -> str:
     return "\n".join(fragments).strip()
 
 
+_MESSAGE_ANSWER_KEYS = ("output_text", "final_answer", "answer", "reasoning")
+
+
 def _normalize_message_content(message: dict) -> str:
     """Extract textual content from an OpenAI-style chat message."""
     if not isinstance(message, dict):
         return ""
 
+    # Common case: a plain string answer with no structured or reasoning payload alongside.
+    content = message.get("content")
+    if isinstance(content, str) and not any(map(message.get, _MESSAGE_ANSWER_KEYS)):
+        stripped = content.strip()
+        if stripped:
+            return stripped
+
     for key in ("output_text", "final_answer", "answer"):
         fragments = _collect_text_fragments(message.get(key), allow_reasoning_text=False)
         if fragments:
@@ -127,50 +150,118 @@ def _normalize_message_content(message: dict) -> str:
     return ""
 
 
+def _delta_text(chunk: object) -> str:
+    """Return the text delta carried by a streamed chat-completion chunk."""
+    choices = getattr(chunk, "choices", None) or []
+    if not choices:
+        return ""
+    delta = getattr(choices[0], "delta", None)
+    content = getattr(delta, "content", None)
+    return content if isinstance(content, str) else ""
+
+
+def _generation_error_message(exc: Exception) -> str:
+    return (
+        "Generation failed because the LLM call raised an error. "
+        f"Details: {exc}. Verify API credentials, base URL, and model availability."
+    )
+
+
 def _sanitize_for_api(text: str) -> str:
     """Return ASCII-safe text to avoid downstream encoding errors."""
     if not isinstance(text, str):
         text = str(text)
-    try:
-        text.encode("ascii")
+    if text.isascii():
         return text
-    except UnicodeEncodeError:
-        return text.encode("ascii", errors="replace").decode("ascii")
+    return _replace_non_ascii(text)
+
+
+@lru_cache(maxsize=256)
+def _replace_non_ascii(text: str) -> str:
+    # Prompts and contexts recur across questions, so the slow path is memoized.
+    return text.encode("ascii", errors="replace").decode("ascii")
 
 
 class ClayGenerator:
     """LLM client used to synthesize answers from retrieved chunks."""
 
-    def __init__(self, config: ModelConfig):
+    def __init__(self, config: ModelConfig, *, cache_dir: Optional[Path] = None):
         self.config = config
         self.provider = (config.provider or "litellm").lower()
+        self.answer_cache = AnswerCache(cache_dir) if cache_dir and config.answer_cache else None
+        self._client_lock = threading.Lock()
+        self._base_url: Optional[str] = None
+        self._api_key: Optional[str] = None
+        self._cborg_client: Optional[OpenAI] = None
+        self._cborg_async_client: Optional[AsyncOpenAI] = None
+        # Identical for every request, so built once and shared by all message lists.
+        self._system_msg = self._build_system_message()
+        if config.prewarm:
+            threading.Thread(target=self._prewarm, name="pyllo-prewarm", daemon=True).start()
+
+    def _prewarm(self) -> None:
+        """Establish DNS/TCP/TLS to the provider so the first query skips the handshake."""
+        try:
+            if self.provider == "cborg":
+                self._get_cborg_client().models.list()
+            elif self.config.api_base:
+                with httpx.Client(timeout=self._http_timeout()) as client:
+                    client.head(self.config.api_base)
+        except Exception:  # pragma: no cover - warming is best effort
+            pass
 
     def _cborg_base_url(self) -> str:
-        if self.config.api_base:
-            return self.config.api_base.rstrip("/")
-        env_base = os.getenv("CBORG_API_BASE")
-        if env_base:
-            return env_base.rstrip("/")
-        return "https://api.cborg.lbl.gov"
+        if self._base_url is None:
+            base = self.config.api_base or os.getenv("CBORG_API_BASE")
+            self._base_url = base.rstrip("/") if base else "https://api.cborg.lbl.gov"
+        return self._base_url
 
     def _cborg_api_key(self) -> str:
-        env_name = self.config.api_key_env or "CBORG_API_KEY"
-        api_key = os.getenv(env_name)
-        if not api_key:
-            raise RuntimeError(
-                f"Missing API key for CBORG provider. Set the environment variable '{env_name}'."
-            )
-        return api_key
+        if self._api_key is None:
+            env_name = self.config.api_key_env or "CBORG_API_KEY"
+            api_key = os.getenv(env_name)
+            if not api_key:
+                raise RuntimeError(
+                    f"Missing API key for CBORG provider. Set the environment variable "
+                    f"'{env_name}'."
+                )
+            self._api_key = api_key
+        return self._api_key
 
-    _cborg_client: Optional[OpenAI] = None
+    def _http_limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.config.max_connections,
+            max_keepalive_connections=self.config.max_keepalive_connections,
+        )
+
+    def _http_timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(self.config.request_timeout, connect=self.config.connect_timeout)
 
     def _get_cborg_client(self) -> OpenAI:
-        base_url = self._cborg_base_url()
-        api_key = self._cborg_api_key()
-        if not self._cborg_client:
-            self._cborg_client = OpenAI(api_key=api_key, base_url=base_url)
+        if self._cborg_client is not None:
+            return self._cborg_client
+        with self._client_lock:
+            if self._cborg_client is None:
+                self._cborg_client = OpenAI(
+                    api_key=self._cborg_api_key(),
+                    base_url=self._cborg_base_url(),
+                    http_client=httpx.Client(
+                        limits=self._http_limits(), timeout=self._http_timeout()
+                    ),
+                )
         return self._cborg_client
 
+    def _get_cborg_async_client(self) -> AsyncOpenAI:
+        if self._cborg_async_client is None:
+            self._cborg_async_client = AsyncOpenAI(
+                api_key=self._cborg_api_key(),
+                base_url=self._cborg_base_url(),
+                http_client=httpx.AsyncClient(
+                    limits=self._http_limits(), timeout=self._http_timeout()
+                ),
+            )
+        return self._cborg_async_client
+
     def _extract_answer(self, data: dict) -> str:
         choices = data.get("choices") or []
         if not choices:
@@ -190,54 +281,242 @@ class ClayGenerator:
                 return text_value
         raise RuntimeError(f"No textual content found in response: {data}")
 
+    def _completion_kwargs(self, messages: List[dict]) -> dict:
+        return {
+            "model": self.config.model,
+            "messages": messages,
+            "temperature": self.config.temperature,
+            "max_tokens": self.config.max_tokens,
+        }
+
     def _invoke_cborg(self, messages: List[dict]) -> dict:
         client = self._get_cborg_client()
-        response = client.chat.completions.create(
-            model=self.config.model,
-            messages=messages,
-            temperature=self.config.temperature,
-            max_tokens=self.config.max_tokens,
-        )
+        response = client.chat.completions.create(**self._completion_kwargs(messages))
         return response.model_dump()
 
-    def generate(self, query: str, chunks: List[RetrievedChunk]) -> GenerationResult:
-        """Generate an answer conditioned on retrieved context."""
-        context_blocks = build_context(chunks)
+    def _invoke_cborg_stream(self, messages: List[dict]) -> Iterator[str]:
+        client = self._get_cborg_client()
+        stream = client.chat.completions.create(**self._completion_kwargs(messages), stream=True)
+        for chunk in stream:
+            yield _delta_text(chunk)
+
+    def _invoke_litellm_stream(self, messages: List[dict]) -> Iterator[str]:
+        stream = completion(**self._completion_kwargs(messages), stream=True)
+        for chunk in stream:
+            yield _delta_text(chunk)
+
+    async def _ainvoke_cborg(self, messages: List[dict]) -> dict:
+        client = self._get_cborg_async_client()
+        response = await client.chat.completions.create(**self._completion_kwargs(messages))
+        return response.model_dump()
+
+    def _supports_cache_control(self) -> bool:
+        model = self.config.model.lower()
+        return "claude" in model or "anthropic" in model
+
+    def _build_messages(self, query: str, context_blocks: List[str]) -> List[dict]:
+        """Assemble chat messages with the reusable prefix (system prompt, context) first.
+
+        Ordering the static system prompt and the retrieved context ahead of the question
+        lets providers with prefix caching skip prefill for repeated prefixes. Anthropic
+        models additionally get an explicit ``cache_control`` breakpoint after the context.
+        """
         context_text = (
             "\n\n".join(context_blocks) if context_blocks else "No supporting context available."
         )
         safe_query = _sanitize_for_api(query)
         safe_context = _sanitize_for_api(context_text)
 
-        messages = [
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {
-                "role": "user",
-                "content": (
-                    f"Question:\n{safe_query}\n\n"
-                    "Context:\n"
-                    f"{safe_context}\n\n"
-                    "Compose a detailed answer as Pyllo. Cite sources using [AuthorYear] tags."
-                ),
-            },
-        ]
+        context_part = _CONTEXT_PART(safe_context)
+        question_part = _QUESTION_PART(safe_query)
+        if self._supports_cache_control():
+            user_content: object = [
+                {"type": "text", "text": context_part, "cache_control": {"type": "ephemeral"}},
+                {"type": "text", "text": question_part},
+            ]
+        else:
+            user_content = context_part + question_part
+
+        return [self._system_msg, {"role": "user", "content": user_content}]
+
+    def _build_system_message(self) -> dict:
+        if self._supports_cache_control():
+            return {
+                "role": "system",
+                "content": [
+                    {"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}
+                ],
+            }
+        return {"role": "system", "content": SYSTEM_PROMPT}
+
+    def _cache_key(self, messages: List[dict]) -> str:
+        payload = {
+            "provider": self.provider,
+            "model": self.config.model,
+            "temperature": self.config.temperature,
+            "max_tokens": self.config.max_tokens,
+            "messages": messages,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def generate(self, query: str, chunks: List[RetrievedChunk]) -> GenerationResult:
+        """Generate an answer conditioned on retrieved context."""
+        context_blocks = build_context(chunks)
+        messages = self._build_messages(query, context_blocks)
+        key = self._cache_key(messages) if self.answer_cache else None
+        cached = self.answer_cache.get(key) if self.answer_cache else None
+        if cached is not None:
+            return GenerationResult(answer=cached, context=context_blocks)
 
         try:
             if self.provider == "cborg":
                 data = self._invoke_cborg(messages)
                 answer = self._extract_answer(data)
             else:
-                response = completion(
-                    model=self.config.model,
-                    messages=messages,
-                    temperature=self.config.temperature,
-                    max_tokens=self.config.max_tokens,
-                )
+                response = completion(**self._completion_kwargs(messages))
                 answer = self._extract_answer(response)
         except Exception as exc:  # pragma: no cover - defensive logging
-            answer = (
-                "Generation failed because the LLM call raised an error. "
-                f"Details: {exc}. Verify API credentials, base URL, and model availability."
-            )
+            answer = _generation_error_message(exc)
+        else:
+            if self.answer_cache:
+                self.answer_cache.put(key, answer)
 
         return GenerationResult(answer=answer, context=context_blocks)
+
+    async def agenerate(self, query: str, chunks: List[RetrievedChunk]) -> GenerationResult:
+        """Asynchronous counterpart of :meth:`generate`."""
+        context_blocks = build_context(chunks)
+        messages = self._build_messages(query, context_blocks)
+        key = self._cache_key(messages) if self.answer_cache else None
+        cached = self.answer_cache.get(key) if self.answer_cache else None
+        if cached is not None:
+            return GenerationResult(answer=cached, context=context_blocks)
+
+        try:
+            if self.provider == "cborg":
+                data = await self._ainvoke_cborg(messages)
+                answer = self._extract_answer(data)
+            else:
+                response = await acompletion(**self._completion_kwargs(messages))
+                answer = self._extract_answer(response)
+        except Exception as exc:  # pragma: no cover - defensive logging
+            answer = _generation_error_message(exc)
+        else:
+            if self.answer_cache:
+                self.answer_cache.put(key, answer)
+
+        return GenerationResult(answer=answer, context=context_blocks)
+
+    async def agenerate_many(
+        self, requests: Iterable[Tuple[str, List[RetrievedChunk]]]
+    ) -> List[GenerationResult]:
+        """Generate answers for several ``(query, chunks)`` pairs concurrently."""
+        return list(await asyncio.gather(*(self.agenerate(q, c) for q, c in requests)))
+
+    def generate_batch(
+        self, items: Iterable[Tuple[str, List[RetrievedChunk]]]
+    ) -> List[GenerationResult]:
+        """Answer several ``(query, chunks)`` pairs, returning results in input order.
+
+        Chat endpoints accept one conversation per request, so the batch is sent as
+        concurrent requests sharing the cached system-prompt prefix, at most
+        ``config.batch_size`` at a time. Must be called outside a running event loop;
+        use :meth:`agenerate_many` from async code.
+        """
+        return asyncio.run(self._agenerate_batch(list(items)))
+
+    async def _agenerate_batch(
+        self, items: List[Tuple[str, List[RetrievedChunk]]]
+    ) -> List[GenerationResult]:
+        owns_client = self._cborg_async_client is None
+        semaphore = asyncio.Semaphore(self.config.batch_size)
+
+        async def run(query: str, chunks: List[RetrievedChunk]) -> GenerationResult:
+            async with semaphore:
+                return await self.agenerate(query, chunks)
+
+        try:
+            return list(await asyncio.gather(*(run(q, c) for q, c in items)))
+        finally:
+            # An async client is bound to the loop it was created on; drop one made here.
+            if owns_client and self._cborg_async_client is not None:
+                await self._cborg_async_client.close()
+                self._cborg_async_client = None
+
+    def generate_stream(self, query: str, chunks: List[RetrievedChunk]) -> GenerationStream:
+        """Stream an answer conditioned on retrieved context as text deltas.
+
+        Iterate the returned :class:`GenerationStream` to receive deltas as the model
+        produces them; its ``result`` holds the assembled :class:`GenerationResult`
+        once the stream is exhausted.
+        """
+        context_blocks = build_context(chunks)
+        messages = self._build_messages(query, context_blocks)
+        on_complete = None
+        if self.answer_cache:
+            key = self._cache_key(messages)
+            cached = self.answer_cache.get(key)
+            if cached is not None:
+                return GenerationStream(iter([cached]), context_blocks)
+            on_complete = partial(self.answer_cache.put, key)
+
+        if self.provider == "cborg":
+            deltas = self._invoke_cborg_stream(messages)
+        else:
+            deltas = self._invoke_litellm_stream(messages)
+        return GenerationStream(deltas, context_blocks, on_complete=on_complete)
+
+
+class GenerationStream:
+    """Iterator over answer text deltas that records the final :class:`GenerationResult`."""
+
+    def __init__(
+        self,
+        deltas: Iterator[str],
+        context: List[str],
+        *,
+        on_complete: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        self._deltas = deltas
+        self._on_complete = on_complete
+        self.context = context
+        self.result: Optional[GenerationResult] = None
+
+    def __iter__(self) -> Iterator[str]:
+        parts: List[str] = []
+        failed = False
+        try:
+            for delta in self._deltas:
+                if delta:
+                    parts.append(delta)
+                    yield delta
+        except Exception as exc:  # pragma: no cover - defensive logging
+            failed = True
+            message = _generation_error_message(exc)
+            if parts:
+                message = "\n\n" + message
+            parts.append(message)
+            yield message
+        self.result = GenerationResult(answer="".join(parts).strip(), context=self.context)
+        if self._on_complete and not failed and self.result.answer:
+            self._on_complete(self.result.answer)
+
+
+class AnswerCache(ShardedFileCache):
+    """Content-addressed on-disk store of generated answers (one JSON file per key)."""
+
+    suffix = ".json"
+
+    def get(self, key: str) -> Optional[str]:
+        data = self._read(key)
+        if data is None:
+            return None
+        try:
+            payload = json.loads(data)
+        except ValueError:
+            return None
+        answer = payload.get("answer") if isinstance(payload, dict) else None
+        return answer if isinstance(answer, str) else None
+
+    def put(self, key: str, answer: str) -> None:
+        self._write(key, json.dumps({"answer": answer}).encode("utf-8"))
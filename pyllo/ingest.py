@@ -3,22 +3,37 @@
 from __future__ import annotations
 
 import hashlib
-import json
+import mmap
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import partial
+from itertools import islice
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import Dict, Iterable, Iterator, List, Tuple
 
+import numpy as np
 from rich.console import Console
-from rich.progress import track
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, SpinnerColumn, TextColumn
 
+from ._compat import atomic_write_bytes, json_dumps, json_loads
 from .chunking import TextChunk, chunk_text
-from .config import Settings
-from .embedding import embed_texts
+from .config import EmbeddingConfig, Settings
+from .embedding import STREAM_BATCHES, EmbeddingCache, embed_texts, embedding_dimension
 from .pdf import extract_full_text
 from .vectorstore import VectorStore
 
 console = Console()
 
+# Redraws are capped at this rate; advancing the bar itself is just a counter update.
+PROGRESS_REFRESH_HZ = 4
+HASH_WORKERS = 8
+# PDFs parsed ahead of the consumer, per worker process; bounds texts held in memory.
+EXTRACT_PREFETCH_PER_WORKER = 2
+HASH_CACHE_FILENAME = "sha256_cache.json"
+EMBED_CACHE_DIRNAME = "embed_cache"
+
 
 @dataclass
 class DocumentMetadata:
@@ -32,11 +47,70 @@ class DocumentMetadata:
 
 def sha256_file(path: Path) -> str:
     """Return SHA256 hash for a file."""
-    h = hashlib.sha256()
     with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            h.update(chunk)
-    return h.hexdigest()
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        h = hashlib.sha256()
+        if os.fstat(f.fileno()).st_size:  # empty files cannot be mapped
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                h.update(mm)
+        return h.hexdigest()
+
+
+def _file_signature(path: Path) -> Tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def hash_files(
+    paths: Iterable[Path], *, cache_path: Path | None = None, max_workers: int = HASH_WORKERS
+) -> Dict[Path, str]:
+    """Return SHA256 hashes for *paths*, hashing concurrently and reusing cached digests.
+
+    Digests are cached under *cache_path* keyed by path and reused while the file's
+    ``(mtime, size)`` is unchanged. Unreadable files are left out of the result.
+    """
+    cache: Dict[str, dict] = {}
+    if cache_path is not None and cache_path.exists():
+        try:
+            cache = json_loads(cache_path.read_bytes())
+        except (OSError, ValueError):
+            cache = {}
+
+    hashes: Dict[Path, str] = {}
+    signatures: Dict[Path, Tuple[int, int]] = {}
+    pending: List[Path] = []
+    for path in paths:
+        try:
+            signature = _file_signature(path)
+        except OSError:
+            continue
+        cached = cache.get(str(path))
+        if cached and (cached.get("mtime_ns"), cached.get("size")) == signature:
+            hashes[path] = cached["sha256"]
+        else:
+            signatures[path] = signature
+            pending.append(path)
+
+    def _safe_hash(path: Path) -> str | None:
+        try:
+            return sha256_file(path)
+        except OSError:
+            return None
+
+    if pending:
+        # hashlib releases the GIL while digesting, so threads overlap I/O and hashing.
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for path, digest in zip(pending, executor.map(_safe_hash, pending)):
+                if digest is None:
+                    continue
+                hashes[path] = digest
+                mtime_ns, size = signatures[path]
+                cache[str(path)] = {"mtime_ns": mtime_ns, "size": size, "sha256": digest}
+
+        if cache_path is not None:
+            atomic_write_bytes(cache_path, json_dumps(cache))
+    return hashes
 
 
 def load_metadata_map(metadata_path: Path) -> Dict[str, dict]:
@@ -44,9 +118,11 @@ def load_metadata_map(metadata_path: Path) -> Dict[str, dict]:
     if not metadata_path.exists():
         return {}
     mapping: Dict[str, dict] = {}
-    with metadata_path.open("r", encoding="utf-8") as f:
+    with metadata_path.open("rb") as f:
         for line in f:
-            entry = json.loads(line)
+            if not line.strip():
+                continue
+            entry = json_loads(line)
             key = entry.get("source_id") or entry.get("slug") or entry.get("filename")
             if key:
                 mapping[str(key)] = entry
@@ -55,20 +131,26 @@ def load_metadata_map(metadata_path: Path) -> Dict[str, dict]:
 
 def discover_pdfs(dirs: Iterable[Path]) -> List[Path]:
     """Find all PDF files under the provided directories."""
-    pdfs: List[Path] = []
+    visited: set[Path] = set()
+    resolved: set[Path] = set()
     for dir_path in dirs:
         if not dir_path.exists():
             continue
-        for path in dir_path.rglob("*.pdf"):
-            pdfs.append(path)
-    return sorted({p.resolve() for p in pdfs})
+        # Walking from the resolved root makes overlapping corpus dirs yield identical
+        # paths, so duplicates are skipped before paying for another resolve().
+        for path in dir_path.resolve().rglob("*.pdf"):
+            if path in visited:
+                continue
+            visited.add(path)
+            resolved.add(path.resolve())
+    return sorted(resolved)
 
 
 def build_document_metadata(
-    path: Path, metadata_map: Dict[str, dict], *, page_count: int
+    path: Path, metadata_map: Dict[str, dict], *, page_count: int, sha: str | None = None
 ) -> DocumentMetadata:
-    """Assemble metadata for a single PDF."""
-    sha = sha256_file(path)
+    """Assemble metadata for a single PDF, hashing it unless *sha* is supplied."""
+    sha = sha or sha256_file(path)
     key = path.stem
     entry = metadata_map.get(key, {})
 
@@ -93,6 +175,89 @@ def build_document_metadata(
     )
 
 
+def _extract_texts(
+    pdf_paths: List[Path], *, max_workers: int | None = None
+) -> Iterator[Tuple[Path, str, int]]:
+    """Parse PDFs in worker processes, yielding ``(path, text, page_count)`` in input order.
+
+    Failures are reported per file and skipped. At most
+    ``EXTRACT_PREFETCH_PER_WORKER`` files per worker are in flight or waiting to be
+    consumed, so memory stays bounded however slowly the caller consumes results.
+    """
+    progress = Progress(
+        SpinnerColumn(),
+        BarColumn(),
+        TextColumn("{task.description}"),
+        MofNCompleteColumn(),
+        console=console,
+        refresh_per_second=PROGRESS_REFRESH_HZ,
+    )
+    workers = max_workers or os.cpu_count() or 1
+    window = workers * EXTRACT_PREFETCH_PER_WORKER
+    with progress, ProcessPoolExecutor(max_workers=workers) as executor:
+        task = progress.add_task("Processing PDFs", total=len(pdf_paths))
+        queued = iter(pdf_paths)
+        futures = deque(executor.submit(extract_full_text, path) for path in islice(queued, window))
+        for path in pdf_paths:
+            future = futures.popleft()
+            # Top the window back up before blocking on the oldest result.
+            for next_path in islice(queued, 1):
+                futures.append(executor.submit(extract_full_text, next_path))
+            try:
+                text, page_count = future.result()
+            except FileNotFoundError:
+                console.print(f"[red]Skipping missing file: {path}[/red]")
+                continue
+            except Exception as exc:
+                console.print(f"[red]Failed to parse {path}: {exc}[/red]")
+                continue
+            finally:
+                progress.advance(task)
+            yield path, text, page_count
+
+
+def _embed_in_batches(texts: List[str], config: EmbeddingConfig) -> np.ndarray:
+    """Embed *texts* in slices encoded concurrently, concatenated in input order."""
+    slice_size = config.batch_size * STREAM_BATCHES
+    slices = [texts[i : i + slice_size] for i in range(0, len(texts), slice_size)]
+    encode = partial(embed_texts, config=config, show_progress_bar=False)
+    if len(slices) <= 1:
+        return encode(texts)
+
+    with ThreadPoolExecutor(max_workers=config.workers) as executor:
+        parts = list(executor.map(encode, slices))
+    return np.concatenate(parts)
+
+
+def _embed_documents(
+    documents: List[Tuple[str, List[str]]], config: EmbeddingConfig, cache: EmbeddingCache
+) -> Tuple[np.ndarray, int]:
+    """Embed each ``(sha256, texts)`` document, reusing cached matrices for unchanged ones.
+
+    Returns the stacked embeddings and how many documents were served from *cache*.
+    """
+    parts: List[np.ndarray | None] = []
+    misses: List[Tuple[int, str, int]] = []
+    to_embed: List[str] = []
+    for sha, texts in documents:
+        key = cache.key(sha, texts)
+        cached = cache.get(key, len(texts))
+        if cached is None:
+            misses.append((len(parts), key, len(texts)))
+            to_embed.extend(texts)
+        parts.append(cached)
+
+    if to_embed:
+        fresh = _embed_in_batches(to_embed, config)
+        offset = 0
+        for position, key, rows in misses:
+            block = fresh[offset : offset + rows]
+            offset += rows
+            cache.put(key, block)
+            parts[position] = block
+    return np.concatenate(parts), len(documents) - len(misses)
+
+
 def ingest_corpus(settings: Settings | None = None) -> Path:
     """Ingest PDFs into an on-disk vector store and return its path."""
     settings = settings or Settings()
@@ -108,21 +273,41 @@ def ingest_corpus(settings: Settings | None = None) -> Path:
         )
         raise FileNotFoundError("No literature PDFs discovered for ingestion.")
 
-    chunks: List[TextChunk] = []
-    raw_texts: List[str] = []
-
     console.print(f"[cyan]Found {len(pdf_paths)} PDF files. Beginning ingestion...")
 
-    for path in track(pdf_paths, description="Processing PDFs"):
-        try:
-            text, page_count = extract_full_text(path)
-        except FileNotFoundError:
-            console.print(f"[red]Skipping missing file: {path}[/red]")
-            continue
-        except Exception as exc:
-            console.print(f"[red]Failed to parse {path}: {exc}[/red]")
-            continue
-        doc_meta = build_document_metadata(path, metadata_map, page_count=page_count)
+    hash_cache_path = (settings.cache_dir or settings.data_dir) / HASH_CACHE_FILENAME
+    sha_map = hash_files(pdf_paths, cache_path=hash_cache_path)
+    embed_cache = EmbeddingCache(
+        (settings.cache_dir or settings.data_dir) / EMBED_CACHE_DIRNAME,
+        settings.embedding.model_name,
+    )
+
+    # Documents are embedded and added to the store in groups while later PDFs are still
+    # being parsed, so only one group of chunks is buffered at a time.
+    flush_size = settings.embedding.batch_size * STREAM_BATCHES * settings.embedding.workers
+    store: VectorStore | None = None
+    pending_chunks: List[TextChunk] = []
+    pending_documents: List[Tuple[str, List[str]]] = []
+    total_chunks = 0
+    total_documents = 0
+    reused_documents = 0
+
+    def flush() -> None:
+        nonlocal store, reused_documents
+        if not pending_documents:
+            return
+        embeddings, reused = _embed_documents(pending_documents, settings.embedding, embed_cache)
+        if store is None:
+            store = VectorStore.empty(embeddings.shape[1])
+        store.add(embeddings, pending_chunks)
+        reused_documents += reused
+        pending_chunks.clear()
+        pending_documents.clear()
+
+    for path, text, page_count in _extract_texts(pdf_paths, max_workers=settings.ingest_workers):
+        doc_meta = build_document_metadata(
+            path, metadata_map, page_count=page_count, sha=sha_map.get(path)
+        )
 
         base_meta = {
             "citation": doc_meta.citation,
@@ -143,13 +328,21 @@ def ingest_corpus(settings: Settings | None = None) -> Path:
             console.print(f"[yellow]Skipping empty document: {path}")
             continue
 
-        chunks.extend(doc_chunks)
-        raw_texts.extend(chunk.content for chunk in doc_chunks)
+        pending_chunks.extend(doc_chunks)
+        pending_documents.append((doc_meta.sha256, [chunk.content for chunk in doc_chunks]))
+        total_chunks += len(doc_chunks)
+        total_documents += 1
+        if len(pending_chunks) >= flush_size:
+            flush()
+    flush()
 
-    console.print(f"[cyan]Creating embeddings for {len(chunks)} chunks...")
-    embeddings = embed_texts(raw_texts, settings.embedding)
-
-    store = VectorStore.from_embeddings(embeddings, chunks)
+    console.print(
+        f"[cyan]Embedded {total_chunks} chunks from {total_documents} documents "
+        f"({reused_documents} reused from cache)."
+    )
+    if store is None:
+        store = VectorStore.empty(embedding_dimension(settings.embedding))
+    store.compact()
     store_path = settings.data_dir / "vectorstore"
     store.save(store_path)
     console.print(f"[green]Vector store saved to {store_path}")
@@ -5,21 +5,117 @@ from __future__ import annotations
 import csv
 import json
 import os
-import time
+import shutil
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import List, Optional, Sequence
+from typing import Dict, List, Optional, Sequence, TextIO, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as URLLib3Error
+from urllib3.util.retry import Retry
+
+try:  # Optional on-disk HTTP cache for Crossref searches.
+    import requests_cache
+except ImportError:  # pragma: no cover - depends on the environment
+    requests_cache = None
+
+from ._slug import slugify
+from ._throttle import HostBuckets, TokenBucket
 
 DEFAULT_MINERAL_DATA_DIR = Path("data") / "minerals"
 DEFAULT_OUTPUT_DIR = DEFAULT_MINERAL_DATA_DIR / "manuscripts"
+MANIFEST_FILENAME = "manuscripts.jsonl"
 
 USER_AGENT = os.environ.get(
     "PYLLO_MINERALS_USER_AGENT",
     "PylloMineralCollector/0.1 (+https://github.com/mwhittaker/pyllo)",
 )
 
+CROSSREF_CACHE_PATH = DEFAULT_MINERAL_DATA_DIR / "crossref_cache"
+CROSSREF_CACHE_TTL = 7 * 86400
+
+DEFAULT_MAX_WORKERS = 8
+CROSSREF_HOST = "api.crossref.org"
+CROSSREF_WORKS_URL = f"https://{CROSSREF_HOST}/works"
+# Per-host budget for DOI resolvers and publisher sites serving PDFs.
+DEFAULT_HOST_RATE = 2.0
+DEFAULT_HOST_BURST = 4
+DOWNLOAD_BUFFER_SIZE = 1 << 20
+
+
+def _mount_pooled_adapter(session: requests.Session) -> requests.Session:
+    """Give *session* a connection pool sized for the worker threads, with retries."""
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=64,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset({"GET", "POST"}),
+            raise_on_status=False,
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Shared by every worker thread: urllib3's pool is thread-safe, so connections (and
+# their TLS sessions) are reused across calls instead of re-handshaking per request.
+_SESSION = _mount_pooled_adapter(requests.Session())
+
+_crossref_session_lock = threading.Lock()
+_crossref_cached_session: Optional[requests.Session] = None
+
+
+def configure_session(session: requests.Session) -> None:
+    """Route all Crossref and download requests through *session*.
+
+    Useful to inject test doubles or custom adapters. The on-disk Crossref cache is
+    bypassed unless *session* is itself a ``requests_cache.CachedSession``.
+    """
+    global _SESSION, _crossref_cached_session
+    with _crossref_session_lock:
+        _SESSION = session
+        _crossref_cached_session = session
+
+
+def _crossref_session() -> requests.Session:
+    """Return the session used for Crossref searches.
+
+    With ``requests-cache`` installed this is one shared SQLite-backed
+    ``CachedSession``, so repeated searches for unchanged minerals skip the network;
+    otherwise it is the shared module session.
+    """
+    global _crossref_cached_session
+    if _crossref_cached_session is None and requests_cache is not None:
+        with _crossref_session_lock:
+            if _crossref_cached_session is None:
+                _crossref_cached_session = _mount_pooled_adapter(
+                    requests_cache.CachedSession(
+                        cache_name=str(CROSSREF_CACHE_PATH),
+                        backend="sqlite",
+                        expire_after=CROSSREF_CACHE_TTL,
+                        allowable_codes=(200,),
+                    )
+                )
+    return _crossref_cached_session or _SESSION
+
+
+def _is_cached_session(session: requests.Session) -> bool:
+    return requests_cache is not None and isinstance(session, requests_cache.CachedSession)
+
+
+def purge_crossref_cache() -> None:
+    """Drop expired Crossref responses from the on-disk cache, if one is in use."""
+    session = _crossref_session()
+    if _is_cached_session(session):
+        session.cache.delete(expired=True)
+
 
 @dataclass
 class Manuscript:
@@ -33,16 +129,6 @@ class Manuscript:
     published: Optional[str] = None
 
 
-def slugify(value: str) -> str:
-    """Return a filesystem-friendly slug for the provided string."""
-
-    return "-".join(
-        part.lower()
-        for part in "".join(ch if ch.isalnum() else " " for ch in value).split()
-        if part
-    )
-
-
 def read_mineral_names(mineral_dir: Path | None = None) -> List[str]:
     """Load mineral names from CSV files located in *mineral_dir*."""
 
@@ -51,9 +137,15 @@ def read_mineral_names(mineral_dir: Path | None = None) -> List[str]:
     names: List[str] = []
     for csv_path in csv_paths:
         with csv_path.open("r", encoding="utf-8") as fp:
-            reader = csv.DictReader(fp)
+            reader = csv.reader(fp)
+            header = next(reader, None) or []
+            name_i = {column: i for i, column in enumerate(header)}.get("Mineral Name")
+            if name_i is None:
+                continue
             for row in reader:
-                name = (row.get("Mineral Name") or "").strip()
+                if len(row) <= name_i:
+                    continue
+                name = row[name_i].strip()
                 if not name:
                     continue
                 names.append(name)
@@ -68,18 +160,37 @@ def read_mineral_names(mineral_dir: Path | None = None) -> List[str]:
     return unique_names
 
 
-def search_crossref(mineral: str, rows: int = 10) -> List[dict]:
-    """Query Crossref for works mentioning the mineral in their titles."""
-
-    url = "https://api.crossref.org/works"
-    params = {
+def _crossref_params(mineral: str, rows: int) -> dict:
+    return {
         "query.title": mineral,
         "filter": "type:journal-article",
         "rows": rows,
         "select": "DOI,title,URL,issued,link",
     }
+
+
+def search_crossref(
+    mineral: str, rows: int = 10, *, throttle: Optional[TokenBucket] = None
+) -> List[dict]:
+    """Query Crossref for works mentioning the mineral in their titles.
+
+    *throttle*, when given, is acquired only before a request that actually goes to
+    the network; responses served from the Crossref cache are returned immediately.
+    """
+
+    url = CROSSREF_WORKS_URL
+    params = _crossref_params(mineral, rows)
     headers = {"User-Agent": USER_AGENT}
-    response = requests.get(url, params=params, headers=headers, timeout=30)
+    session = _crossref_session()
+    response = None
+    if throttle is not None and _is_cached_session(session):
+        cached = session.get(url, params=params, headers=headers, only_if_cached=True)
+        if cached.status_code != 504:  # requests-cache answers 504 for a cache miss
+            response = cached
+    if response is None:
+        if throttle is not None:
+            throttle.acquire()
+        response = session.get(url, params=params, headers=headers, timeout=30)
     response.raise_for_status()
     payload = response.json()
     return payload.get("message", {}).get("items", [])
@@ -104,8 +215,13 @@ class DownloadError(RuntimeError):
     """Raised when a manuscript download does not yield a valid PDF."""
 
 
-def download_pdf(candidate_urls: Sequence[str], path: Path) -> None:
-    """Attempt to download a PDF from the provided candidate URLs."""
+def download_pdf(
+    candidate_urls: Sequence[str], path: Path, *, buckets: Optional[HostBuckets] = None
+) -> None:
+    """Attempt to download a PDF from the provided candidate URLs.
+
+    When *buckets* is given, each attempt first takes a token for the URL's host.
+    """
 
     if path.exists():
         return
@@ -115,8 +231,10 @@ def download_pdf(candidate_urls: Sequence[str], path: Path) -> None:
         if not url:
             continue
         headers = {"User-Agent": USER_AGENT, "Accept": "application/pdf"}
+        if buckets is not None:
+            buckets.acquire(url)
         try:
-            with requests.get(
+            with _SESSION.get(
                 url, headers=headers, timeout=60, stream=True, allow_redirects=True
             ) as resp:
                 resp.raise_for_status()
@@ -125,23 +243,25 @@ def download_pdf(candidate_urls: Sequence[str], path: Path) -> None:
                     attempts.append(f"{url} -> {content_type or 'unknown'}")
                     continue
 
-                first_bytes = b""
-                with path.open("wb") as fp:
-                    for chunk in resp.iter_content(chunk_size=8192):
-                        if not chunk:
-                            continue
-                        if len(first_bytes) < 8:
-                            needed = 8 - len(first_bytes)
-                            first_bytes += chunk[:needed]
-                        fp.write(chunk)
-
+                # Check the signature before writing anything, then let copyfileobj move
+                # the rest of the (decoded) body straight from the socket in large reads.
+                resp.raw.decode_content = True
+                first_bytes = resp.raw.read(8)
                 if b"%PDF" not in first_bytes:
-                    path.unlink(missing_ok=True)
                     attempts.append(f"{url} -> missing %PDF signature")
                     continue
 
+                try:
+                    with path.open("wb", buffering=DOWNLOAD_BUFFER_SIZE) as fp:
+                        fp.write(first_bytes)
+                        shutil.copyfileobj(resp.raw, fp, length=DOWNLOAD_BUFFER_SIZE)
+                except BaseException:
+                    path.unlink(missing_ok=True)
+                    raise
+
                 return
-        except requests.RequestException as exc:
+        except (requests.RequestException, URLLib3Error) as exc:
+            # Reading resp.raw surfaces mid-body failures as urllib3 errors.
             attempts.append(f"{url} -> {exc}")
 
     raise DownloadError("; ".join(attempts) or "No valid download URLs provided")
@@ -156,6 +276,7 @@ def collect_mineral_manuscripts(
     crossref_rows: int = 12,
     sleep_seconds: float = 1.0,
     download: bool = True,
+    max_workers: int = DEFAULT_MAX_WORKERS,
 ) -> List[Manuscript]:
     """Collect manuscripts for minerals and optionally download PDFs.
 
@@ -174,10 +295,16 @@ def collect_mineral_manuscripts(
     crossref_rows:
         Number of Crossref results fetched per mineral before filtering.
     sleep_seconds:
-        Delay between Crossref requests to remain polite.
+        Minimum spacing between Crossref requests across all workers, to remain
+        polite. Other hosts are limited to ``DEFAULT_HOST_RATE`` requests per second.
     download:
         If ``True`` download PDF files whenever a direct link is provided by
         Crossref. Set to ``False`` to only collect metadata.
+    max_workers:
+        Threads used for Crossref searches, and again for PDF downloads.
+
+    Each mineral's entries are written to its ``metadata.json`` and appended to
+    ``manuscripts.jsonl`` in *output_dir* once its downloads finish.
     """
 
     mineral_dir = mineral_dir or DEFAULT_MINERAL_DATA_DIR
@@ -185,84 +312,154 @@ def collect_mineral_manuscripts(
 
     minerals = list(minerals or read_mineral_names(mineral_dir))
     collected: List[Manuscript] = []
+    crossref_bucket = TokenBucket(1.0 / sleep_seconds if sleep_seconds > 0 else 0.0)
+    host_buckets = HostBuckets(
+        DEFAULT_HOST_RATE, DEFAULT_HOST_BURST, overrides={CROSSREF_HOST: crossref_bucket}
+    )
 
-    for mineral in minerals:
+    def search(mineral: str) -> Tuple[str, Optional[List[dict]]]:
         try:
-            results = search_crossref(mineral, rows=crossref_rows)
+            return mineral, search_crossref(mineral, rows=crossref_rows, throttle=crossref_bucket)
         except requests.RequestException as exc:
             print(f"[crossref] failed for {mineral}: {exc}")
-            continue
+            return mineral, None
+
+    # Stage 1 runs the Crossref searches on one pool; as each mineral's results arrive
+    # in order, its PDF downloads go to a second pool (stage 2) so they start right away
+    # instead of queueing behind the remaining searches. The download that finishes a
+    # mineral writes its metadata.json, so progress is on disk as minerals complete.
+    lock = threading.Lock()
+    pending: Dict[int, int] = {}
+    per_mineral: List[Tuple[Path, List[Manuscript]]] = []
+    downloads: List[Future] = []
+
+    manifest_path = output_dir / MANIFEST_FILENAME
+    with manifest_path.open("a", encoding="utf-8") as manifest:
+
+        def finish(position: int) -> None:
+            with lock:
+                pending[position] -= 1
+                if not pending[position]:
+                    _write_mineral_metadata(*per_mineral[position], manifest)
+
+        def fetch(position: int, manuscript: Manuscript, candidates: List[str]) -> None:
+            try:
+                download_pdf(candidates, manuscript.pdf_path, buckets=host_buckets)
+            except (requests.RequestException, DownloadError) as exc:
+                print(f"[download] failed for {manuscript.mineral}: {exc}")
+                manuscript.pdf_path = None
+            finally:
+                finish(position)
+
+        searcher = ThreadPoolExecutor(max_workers=max_workers)
+        downloader = ThreadPoolExecutor(max_workers=max_workers)
+        with searcher, downloader:
+            for mineral, results in searcher.map(search, minerals):
+                if results is None:
+                    continue
 
-        mineral_slug = slugify(mineral)
-        mineral_dir_path = ensure_directory(output_dir / mineral_slug)
+                mineral_dir_path = ensure_directory(output_dir / slugify(mineral))
+                selected = _select_manuscripts(
+                    mineral,
+                    results,
+                    mineral_dir_path,
+                    max_per_mineral=max_per_mineral,
+                    download=download,
+                )
+                manuscripts = [manuscript for manuscript, _ in selected]
+                collected.extend(manuscripts)
+                with lock:
+                    position = len(per_mineral)
+                    per_mineral.append((mineral_dir_path, manuscripts))
+                    # One count for the search itself keeps the mineral open until all
+                    # of its downloads are queued.
+                    pending[position] = 1 + (len(selected) if download else 0)
+                if download:
+                    for manuscript, candidates in selected:
+                        downloads.append(downloader.submit(fetch, position, manuscript, candidates))
+                finish(position)
+
+        for future in downloads:
+            future.result()  # re-raise unexpected errors, e.g. writing metadata.json
 
-        hits = 0
-        seen_keys = set()
-        for item in results:
-            title_list = item.get("title") or []
-            title = title_list[0] if title_list else "Untitled"
-            if mineral.lower() not in title.lower():
-                continue
-            doi = item.get("DOI")
-            pdf_url = extract_pdf_link(item)
-            doi_url = None
-            if doi:
-                doi_url = doi if doi.lower().startswith("http") else f"https://doi.org/{doi}"
-            key = doi or title.lower()
-            if key in seen_keys:
-                continue
-            seen_keys.add(key)
-
-            source_url = item.get("URL") or ""
-            pdf_path = None
-            if download:
-                pdf_filename = slugify(title) or (doi.replace("/", "-") if doi else "manuscript")
-                pdf_path = mineral_dir_path / f"{pdf_filename}.pdf"
-                candidates: List[str] = []
-                if pdf_url:
-                    candidates.append(pdf_url)
-                if doi_url:
-                    candidates.append(doi_url)
-                if source_url:
-                    candidates.append(source_url)
-                try:
-                    download_pdf(candidates, pdf_path)
-                except (requests.RequestException, DownloadError) as exc:
-                    print(f"[download] failed for {mineral}: {exc}")
-                    pdf_path = None
-
-            issued = item.get("issued", {}).get("date-parts", [])
-            published = None
-            if issued:
-                parts = issued[0]
-                published = "-".join(str(part) for part in parts)
-
-            manuscript = Manuscript(
-                mineral=mineral,
-                title=title,
-                doi=doi,
-                source_url=source_url or pdf_url or (doi_url or ""),
-                pdf_path=pdf_path,
-                published=published,
-            )
-            collected.append(manuscript)
-            hits += 1
-            if hits >= max_per_mineral:
-                break
-
-        metadata_path = mineral_dir_path / "metadata.json"
-        mineral_entries = []
-        for m in collected:
-            if m.mineral != mineral:
-                continue
-            entry = asdict(m)
-            if entry.get("pdf_path"):
-                entry["pdf_path"] = str(entry["pdf_path"])
-            mineral_entries.append(entry)
-        with metadata_path.open("w", encoding="utf-8") as fp:
-            json.dump(mineral_entries, fp, indent=2)
+    return collected
 
-        if sleep_seconds:
-            time.sleep(sleep_seconds)
 
-    return collected
+def _select_manuscripts(
+    mineral: str,
+    results: Sequence[dict],
+    mineral_dir_path: Path,
+    *,
+    max_per_mineral: int,
+    download: bool,
+) -> List[Tuple[Manuscript, List[str]]]:
+    """Pick up to *max_per_mineral* distinct Crossref items whose title names *mineral*.
+
+    Returns each manuscript with its candidate download URLs (empty unless *download*).
+    """
+    selected: List[Tuple[Manuscript, List[str]]] = []
+    seen_keys = set()
+    # casefold() matches case-insensitively beyond ASCII (e.g. "ß" vs "SS").
+    mineral_key = mineral.casefold()
+    for item in results:
+        title_list = item.get("title") or []
+        title = title_list[0] if title_list else "Untitled"
+        title_key = title.casefold()
+        if mineral_key not in title_key:
+            continue
+        doi = item.get("DOI")
+        pdf_url = extract_pdf_link(item)
+        doi_url = None
+        if doi:
+            doi_url = doi if doi.lower().startswith("http") else f"https://doi.org/{doi}"
+        key = doi or title_key
+        if key in seen_keys:
+            continue
+        seen_keys.add(key)
+
+        source_url = item.get("URL") or ""
+        pdf_path = None
+        candidates: List[str] = []
+        if download:
+            pdf_filename = slugify(title) or (doi.replace("/", "-") if doi else "manuscript")
+            pdf_path = mineral_dir_path / f"{pdf_filename}.pdf"
+            if pdf_url:
+                candidates.append(pdf_url)
+            if doi_url:
+                candidates.append(doi_url)
+            if source_url:
+                candidates.append(source_url)
+
+        issued = item.get("issued", {}).get("date-parts", [])
+        published = None
+        if issued:
+            parts = issued[0]
+            published = "-".join(str(part) for part in parts)
+
+        manuscript = Manuscript(
+            mineral=mineral,
+            title=title,
+            doi=doi,
+            source_url=source_url or pdf_url or (doi_url or ""),
+            pdf_path=pdf_path,
+            published=published,
+        )
+        selected.append((manuscript, candidates))
+        if len(selected) >= max_per_mineral:
+            break
+    return selected
+
+
+def _write_mineral_metadata(
+    mineral_dir_path: Path, manuscripts: List[Manuscript], manifest: TextIO
+) -> None:
+    """Write a finished mineral's ``metadata.json`` and append its run manifest lines."""
+    mineral_entries = []
+    for m in manuscripts:
+        entry = asdict(m)
+        if entry.get("pdf_path"):
+            entry["pdf_path"] = str(entry["pdf_path"])
+        mineral_entries.append(entry)
+        manifest.write(json.dumps(entry) + "\n")
+    with (mineral_dir_path / "metadata.json").open("w", encoding="utf-8") as fp:
+        json.dump(mineral_entries, fp, indent=2)
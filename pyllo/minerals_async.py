@@ -0,0 +1,184 @@
+"""Asyncio variant of the mineral manuscript collector."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import AsyncIterator, List, Sequence
+
+import httpx
+
+from ._slug import slugify
+from ._throttle import AsyncHostBuckets, AsyncTokenBucket
+from .minerals import (
+    CROSSREF_HOST,
+    CROSSREF_WORKS_URL,
+    DEFAULT_HOST_BURST,
+    DEFAULT_HOST_RATE,
+    DEFAULT_MINERAL_DATA_DIR,
+    DEFAULT_OUTPUT_DIR,
+    DOWNLOAD_BUFFER_SIZE,
+    MANIFEST_FILENAME,
+    USER_AGENT,
+    DownloadError,
+    Manuscript,
+    _crossref_params,
+    _select_manuscripts,
+    _write_mineral_metadata,
+    ensure_directory,
+    read_mineral_names,
+)
+
+DEFAULT_MAX_CONCURRENCY = 16
+MAX_CONNECTIONS = 32
+MAX_KEEPALIVE_CONNECTIONS = 16
+CONNECT_RETRIES = 3
+
+
+async def _search_crossref(
+    client: httpx.AsyncClient, mineral: str, rows: int, *, throttle: AsyncTokenBucket
+) -> List[dict]:
+    """Async counterpart of :func:`pyllo.minerals.search_crossref` (no on-disk cache)."""
+    await throttle.acquire()
+    response = await client.get(
+        CROSSREF_WORKS_URL,
+        params=_crossref_params(mineral, rows),
+        headers={"User-Agent": USER_AGENT},
+        timeout=30,
+    )
+    response.raise_for_status()
+    payload = response.json()
+    return payload.get("message", {}).get("items", [])
+
+
+async def _write_body(path: Path, head: bytes, chunks: AsyncIterator[bytes]) -> None:
+    # File writes go to the default executor so the loop keeps servicing other sockets.
+    try:
+        with path.open("wb") as fp:
+            await asyncio.to_thread(fp.write, head)
+            async for chunk in chunks:
+                await asyncio.to_thread(fp.write, chunk)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+
+
+async def _download_pdf(
+    client: httpx.AsyncClient,
+    candidate_urls: Sequence[str],
+    path: Path,
+    *,
+    buckets: AsyncHostBuckets,
+) -> None:
+    """Async counterpart of :func:`pyllo.minerals.download_pdf`."""
+    if path.exists():
+        return
+
+    attempts: List[str] = []
+    for url in candidate_urls:
+        if not url:
+            continue
+        headers = {"User-Agent": USER_AGENT, "Accept": "application/pdf"}
+        await buckets.acquire(url)
+        try:
+            async with client.stream("GET", url, headers=headers, timeout=60) as resp:
+                resp.raise_for_status()
+                content_type = resp.headers.get("content-type", "").lower()
+                if "pdf" not in content_type:
+                    attempts.append(f"{url} -> {content_type or 'unknown'}")
+                    continue
+
+                chunks = resp.aiter_bytes(DOWNLOAD_BUFFER_SIZE)
+                head = b""
+                async for chunk in chunks:
+                    head += chunk
+                    if len(head) >= 8:
+                        break
+                if b"%PDF" not in head[:8]:
+                    attempts.append(f"{url} -> missing %PDF signature")
+                    continue
+
+                await _write_body(path, head, chunks)
+                return
+        except httpx.HTTPError as exc:
+            attempts.append(f"{url} -> {exc}")
+
+    raise DownloadError("; ".join(attempts) or "No valid download URLs provided")
+
+
+async def acollect_mineral_manuscripts(
+    minerals: Sequence[str] | None = None,
+    mineral_dir: Path | None = None,
+    output_dir: Path | None = None,
+    *,
+    max_per_mineral: int = 3,
+    crossref_rows: int = 12,
+    sleep_seconds: float = 1.0,
+    download: bool = True,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> List[Manuscript]:
+    """Concurrent variant of :func:`pyllo.minerals.collect_mineral_manuscripts`.
+
+    Up to *max_concurrency* minerals are searched and downloaded at once over one
+    pooled ``httpx.AsyncClient``, under the same Crossref spacing (*sleep_seconds*)
+    and per-host budgets as the threaded collector. Searches always go to the
+    network; the ``requests-cache`` Crossref cache is only used by the threaded
+    collector. Results are returned in mineral order.
+    """
+    mineral_dir = mineral_dir or DEFAULT_MINERAL_DATA_DIR
+    output_dir = ensure_directory(output_dir or DEFAULT_OUTPUT_DIR)
+
+    minerals = list(minerals or read_mineral_names(mineral_dir))
+    crossref_bucket = AsyncTokenBucket(1.0 / sleep_seconds if sleep_seconds > 0 else 0.0)
+    host_buckets = AsyncHostBuckets(
+        DEFAULT_HOST_RATE, DEFAULT_HOST_BURST, overrides={CROSSREF_HOST: crossref_bucket}
+    )
+    semaphore = asyncio.Semaphore(max(max_concurrency, 1))
+    transport = httpx.AsyncHTTPTransport(
+        retries=CONNECT_RETRIES,
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+        ),
+    )
+
+    manifest_path = output_dir / MANIFEST_FILENAME
+    with manifest_path.open("a", encoding="utf-8") as manifest:
+        async with httpx.AsyncClient(transport=transport, follow_redirects=True) as client:
+
+            async def fetch(manuscript: Manuscript, candidates: List[str]) -> None:
+                try:
+                    await _download_pdf(
+                        client, candidates, manuscript.pdf_path, buckets=host_buckets
+                    )
+                except (httpx.HTTPError, DownloadError) as exc:
+                    print(f"[download] failed for {manuscript.mineral}: {exc}")
+                    manuscript.pdf_path = None
+
+            async def process(mineral: str) -> List[Manuscript]:
+                async with semaphore:
+                    try:
+                        results = await _search_crossref(
+                            client, mineral, crossref_rows, throttle=crossref_bucket
+                        )
+                    except (httpx.HTTPError, ValueError) as exc:
+                        print(f"[crossref] failed for {mineral}: {exc}")
+                        return []
+
+                    mineral_dir_path = ensure_directory(output_dir / slugify(mineral))
+                    selected = _select_manuscripts(
+                        mineral,
+                        results,
+                        mineral_dir_path,
+                        max_per_mineral=max_per_mineral,
+                        download=download,
+                    )
+                    if download:
+                        await asyncio.gather(*(fetch(m, candidates) for m, candidates in selected))
+                    manuscripts = [manuscript for manuscript, _ in selected]
+                    _write_mineral_metadata(mineral_dir_path, manuscripts, manifest)
+                    return manuscripts
+
+            per_mineral = await asyncio.gather(*(process(mineral) for mineral in minerals))
+
+    return [manuscript for manuscripts in per_mineral for manuscript in manuscripts]
@@ -2,12 +2,18 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from itertools import repeat
 from pathlib import Path
-from typing import Iterable, Tuple
+from typing import Iterable, List, Optional, Tuple
 
 import fitz  # type: ignore
 
+# Documents shorter than this are read in-process; a pool costs more than it saves.
+PARALLEL_MIN_PAGES = 16
+PAGES_PER_TASK = 8
+
 
 @dataclass
 class PageContent:
@@ -31,8 +37,30 @@ class PDFExtractor:
                 yield PageContent(page_number=index + 1, text=text)
 
 
-def extract_full_text(path: Path) -> Tuple[str, int]:
-    """Convenience helper to load a PDF to a single text string and page count."""
+def _extract_page_range(path: str, start: int, stop: int) -> List[str]:
+    # MuPDF documents cannot be pickled, so each worker opens the file itself.
+    with fitz.open(path) as doc:
+        return [doc[index].get_text("text") for index in range(start, stop)]
+
+
+def extract_full_text(path: Path, *, max_workers: Optional[int] = None) -> Tuple[str, int]:
+    """Convenience helper to load a PDF to a single text string and page count.
+
+    With ``max_workers`` above one, documents of at least ``PARALLEL_MIN_PAGES`` pages
+    are split into page ranges extracted in a process pool. Leave it unset when files
+    are already being processed in parallel (as ``ingest_corpus`` does).
+    """
+    if max_workers and max_workers > 1:
+        with fitz.open(path) as doc:
+            page_count = doc.page_count
+        if page_count >= PARALLEL_MIN_PAGES:
+            starts = range(0, page_count, PAGES_PER_TASK)
+            stops = [min(start + PAGES_PER_TASK, page_count) for start in starts]
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                ranges = executor.map(_extract_page_range, repeat(str(path)), starts, stops)
+                texts = [text for block in ranges for text in block]
+            return "\n\n".join(texts), page_count
+
     extractor = PDFExtractor()
     pages = list(extractor.extract(path))
     combined = "\n\n".join(page.text for page in pages)
@@ -3,9 +3,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import List, Sequence
 
 from .config import Settings
-from .generator import ClayGenerator, GenerationResult
+from .generator import ClayGenerator, GenerationResult, GenerationStream
 from .retriever import Retriever
 
 
@@ -23,10 +24,25 @@ class ClayRAG:
         self.settings = settings
         self.settings.ensure_dirs()
         self.retriever = Retriever(settings)
-        self.generator = ClayGenerator(settings.model)
+        cache_root = settings.cache_dir or settings.data_dir
+        self.generator = ClayGenerator(settings.model, cache_dir=cache_root / "answer_cache")
 
     def answer(self, query: str) -> RAGAnswer:
         """Return an answer with supporting context for the provided query."""
         retrieved = self.retriever.retrieve(query)
         result: GenerationResult = self.generator.generate(query, retrieved)
         return RAGAnswer(query=query, answer=result.answer, context=result.context)
+
+    def answer_batch(self, queries: Sequence[str]) -> List[RAGAnswer]:
+        """Answer several queries, batching retrieval and generation across them."""
+        retrieved = self.retriever.retrieve_batch(queries)
+        results = self.generator.generate_batch(zip(queries, retrieved))
+        return [
+            RAGAnswer(query=query, answer=result.answer, context=result.context)
+            for query, result in zip(queries, results)
+        ]
+
+    def answer_stream(self, query: str) -> GenerationStream:
+        """Retrieve context for *query* and stream the generated answer."""
+        retrieved = self.retriever.retrieve(query)
+        return self.generator.generate_stream(query, retrieved)
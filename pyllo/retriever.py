@@ -2,14 +2,85 @@
 
 from __future__ import annotations
 
+import atexit
+import hashlib
+import io
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Sequence
 
+import numpy as np
+
+from ._compat import atomic_write_bytes
 from .config import EmbeddingConfig, RetrieverConfig, Settings
 from .embedding import embed_texts
 from .vectorstore import VectorRecord, VectorStore
 
+QUERY_CACHE_FILENAME = "query_emb_cache.npz"
+
+
+class _QueryEmbeddingCache:
+    """LRU of query embeddings persisted to one ``.npz`` file.
+
+    There is one instance per file (see :func:`_query_cache_for`), shared by every
+    Retriever using that file, so their entries merge instead of overwriting each other.
+    """
+
+    def __init__(self, path: Path, max_size: int) -> None:
+        self.path = path
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._load()
+
+    def get(self, key: str) -> np.ndarray | None:
+        embedding = self._entries.get(key)
+        if embedding is not None:
+            self._entries.move_to_end(key)
+        return embedding
+
+    def put(self, key: str, embedding: np.ndarray) -> None:
+        self._entries[key] = embedding
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _load(self) -> None:
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                keys, vectors = data["keys"].tolist(), data["vectors"]
+        except (OSError, KeyError, ValueError):
+            return
+        for key, vector in list(zip(keys, vectors))[-self.max_size :]:
+            self._entries[key] = vector
+
+    def save(self) -> None:
+        if not self._entries:
+            return
+        keys = np.array(list(self._entries))
+        vectors = np.stack(list(self._entries.values()))
+        buffer = io.BytesIO()
+        np.savez(buffer, keys=keys, vectors=vectors)
+        atomic_write_bytes(self.path, buffer.getvalue())
+
+
+_QUERY_CACHES: Dict[Path, _QueryEmbeddingCache] = {}
+
+
+def _query_cache_for(path: Path, max_size: int) -> _QueryEmbeddingCache:
+    cache = _QUERY_CACHES.get(path)
+    if cache is None:
+        cache = _QUERY_CACHES[path] = _QueryEmbeddingCache(path, max_size)
+    else:
+        cache.max_size = max(cache.max_size, max_size)
+    return cache
+
+
+@atexit.register
+def save_query_caches() -> None:
+    """Persist every query-embedding cache so later sessions start warm."""
+    for cache in _QUERY_CACHES.values():
+        cache.save()
+
 
 @dataclass
 class RetrievedChunk:
@@ -33,10 +104,63 @@ class Retriever:
         self.retriever_config = retriever_config or settings.retriever
         self.store_path = store_path or settings.data_dir / "vectorstore"
         self.store = VectorStore.load(self.store_path)
+        self.query_cache_path = settings.data_dir / QUERY_CACHE_FILENAME
+        self._query_cache: _QueryEmbeddingCache | None = None
+        if self.retriever_config.query_cache_size:
+            # Module-level and saved by one atexit hook, so it does not pin this instance.
+            self._query_cache = _query_cache_for(
+                self.query_cache_path, self.retriever_config.query_cache_size
+            )
+
+    def _query_key(self, query: str) -> str:
+        payload = f"{self.embedding_config.model_name}\0{query}".encode("utf-8")
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    def _embed_queries(self, queries: Sequence[str]) -> np.ndarray:
+        """Return a fresh embedding matrix for *queries*, reusing cached rows.
+
+        Cache misses are embedded together in a single call.
+        """
+        cache = self._query_cache
+        if cache is None:
+            return embed_texts(list(queries), self.embedding_config, show_progress_bar=False)
+        keys = [self._query_key(query) for query in queries]
+        rows: List[np.ndarray | None] = []
+        missing: dict[str, str] = {}
+        for key, query in zip(keys, queries):
+            embedding = cache.get(key)
+            if embedding is None:
+                missing.setdefault(key, query)
+            rows.append(embedding)
+        if missing:
+            embeddings = embed_texts(
+                list(missing.values()), self.embedding_config, show_progress_bar=False
+            )
+            for key, embedding in zip(missing, embeddings):
+                cache.put(key, embedding)
+            fresh = dict(zip(missing, embeddings))
+            rows = [fresh[key] if row is None else row for key, row in zip(keys, rows)]
+        # np.stack copies, so search() may normalize the matrix without touching the cache.
+        return np.stack(rows)
+
+    def save_query_cache(self) -> None:
+        """Persist cached query embeddings now rather than waiting for interpreter exit."""
+        if self._query_cache is not None:
+            self._query_cache.save()
 
     def retrieve(self, query: str, *, top_k: int | None = None) -> List[RetrievedChunk]:
         """Retrieve relevant chunks for the provided query string."""
+        return self.retrieve_batch([query], top_k=top_k)[0]
+
+    def retrieve_batch(
+        self, queries: Sequence[str], *, top_k: int | None = None
+    ) -> List[List[RetrievedChunk]]:
+        """Retrieve chunks for several queries with one embedding call and one search."""
+        if not queries:
+            return []
         top_k = top_k or self.retriever_config.top_k
-        query_emb = embed_texts([query], self.embedding_config)
-        results = self.store.search(query_emb, top_k=top_k)[0]
-        return [RetrievedChunk(record=record, score=score) for record, score in results]
+        query_emb = self._embed_queries(queries)
+        rows = self.store.search(query_emb, top_k=top_k)
+        return [
+            [RetrievedChunk(record=record, score=score) for record, score in row] for row in rows
+        ]
@@ -2,23 +2,54 @@
 
 from __future__ import annotations
 
+import asyncio
 import csv
 import os
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
+from html import unescape as html_unescape
 from pathlib import Path
-from typing import List, Optional, Sequence
+from typing import Any, List, Optional, Sequence
 from urllib.parse import urljoin
 
+import httpx
 import requests
-from bs4 import BeautifulSoup
 from rich.console import Console
 
+try:  # pymatgen is heavy and optional; loaded once here rather than per call.
+    from pymatgen.core import Composition, Structure
+except ImportError:  # pragma: no cover - depends on the environment
+    Composition = Structure = None
+
+from ._slug import slugify
+from ._throttle import AsyncHostBuckets
+
 RRUFF_SEARCH_URL = "https://rruff.geo.arizona.edu/AMS/result.php"
 RRUFF_BASE_URL = "https://rruff.geo.arizona.edu"
 MATERIALS_SUMMARY_URL = "https://api.materialsproject.org/materials/summary/"
 
+# Transient responses are retried with exponential backoff (0.5 s, 1 s, 2 s); the
+# transport separately retries failed connection attempts.
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 0.5
+RETRY_STATUSES = frozenset({429, 502, 503})
+
+# Anchor hrefs (double-, single- or un-quoted); only the CIF download links are needed,
+# so a targeted scan replaces building a full DOM of the results page.
+_ANCHOR_HREF_RE = re.compile(
+    r"""<a\b[^>]*?\bhref\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""", re.IGNORECASE
+)
+
+# Formula clean-up: drop whitespace and grouping/superscript markers, strip charges,
+# then split hydrates on their middle-dot separators.
+_FORMULA_STRIP_TABLE = str.maketrans("", "", " {}[]^")
+_STRIP_CHARGE_RE = re.compile(r"(\d)[+-]")
+_STRIP_SIGN_RE = re.compile(r"[+-]")
+_HYDRATE_SPLIT_RE = re.compile(r"[·•∙]")
+
 
 @dataclass(frozen=True)
 class MineralRecord:
@@ -44,11 +75,6 @@ class StructureDownloaderError(RuntimeError):
     """Raised when structural downloads cannot proceed."""
 
 
-def slugify(text: str) -> str:
-    sanitized = re.sub(r"[^a-z0-9]+", "-", text.lower())
-    return sanitized.strip("-")
-
-
 def ensure_structure_dirs(base_dir: Path) -> tuple[Path, Path]:
     experimental_dir = base_dir / "structure" / "experimental"
     simulated_dir = base_dir / "structure" / "simulated"
@@ -64,15 +90,30 @@ def read_mineral_records(
     records: List[MineralRecord] = []
 
     with csv_path.open("r", encoding="utf-8") as handle:
-        reader = csv.DictReader(handle)
+        reader = csv.reader(handle)
+        header = next(reader, None)
+        if header is None:
+            return records
+        width = len(header)
+        col = {column: i for i, column in enumerate(header)}
+        # Missing columns point at the blank cell appended to every row below.
+        name_i = col.get("Mineral Name", width)
+        ima_formula_i = col.get("IMA Chemistry (plain)", width)
+        rruff_formula_i = col.get("RRUFF Chemistry (plain)", width)
+        elements_i = col.get("Chemistry Elements", width)
+        padding = [""] * width
         for row in reader:
-            name = row.get("Mineral Name", "").strip()
+            if len(row) != width:
+                # Ragged row: pad or trim to the header, as DictReader would.
+                row = (row + padding)[:width]
+            row.append("")
+            name = row[name_i].strip()
             if not name:
                 continue
             if restrict_normalized and name.lower() not in restrict_normalized:
                 continue
-            formula = row.get("IMA Chemistry (plain)") or row.get("RRUFF Chemistry (plain)") or None
-            elements_raw = row.get("Chemistry Elements") or ""
+            formula = row[ima_formula_i] or row[rruff_formula_i] or None
+            elements_raw = row[elements_i]
             elements = tuple(
                 sorted({item for item in elements_raw.replace(",", " ").split() if item})
             )
@@ -82,24 +123,22 @@ def read_mineral_records(
     return records
 
 
+@lru_cache(maxsize=8192)
 def normalize_formula(formula: str) -> Optional[str]:
+    # Pure in *formula*, so results are memoized; minerals often share formulas.
     if not formula:
         return None
 
-    sanitized = formula.replace(" ", "")
-    sanitized = sanitized.replace("{", "").replace("}", "").replace("[", "").replace("]", "")
-    sanitized = sanitized.replace("^", "")
-    sanitized = re.sub(r"(\d)[+-]", r"\1", sanitized)
-    sanitized = re.sub(r"[+-]", "", sanitized)
+    sanitized = formula.translate(_FORMULA_STRIP_TABLE)
+    sanitized = _STRIP_CHARGE_RE.sub(r"\1", sanitized)
+    sanitized = _STRIP_SIGN_RE.sub("", sanitized)
 
-    parts = re.split(r"[·•∙]", sanitized)
+    parts = _HYDRATE_SPLIT_RE.split(sanitized)
 
-    try:
-        from pymatgen.core import Composition
-    except ImportError as exc:
+    if Composition is None:
         raise StructureDownloaderError(
             "pymatgen is required to normalize mineral formulas. Install pymatgen to continue."
-        ) from exc
+        )
 
     total = None
     for part in parts:
@@ -121,15 +160,8 @@ def normalize_formula(formula: str) -> Optional[str]:
     return total.reduced_formula
 
 
-def download_rruff_cif(
-    mineral: MineralRecord,
-    output_dir: Path,
-    *,
-    session: Optional[requests.Session] = None,
-    sleep_seconds: float = 0.8,
-) -> DownloadResult:
-    sess = session or requests.Session()
-    payload = {
+def _rruff_search_payload(mineral: MineralRecord) -> dict:
+    return {
         "Mineral": mineral.name,
         "Author": "",
         "Periodic": "",
@@ -141,6 +173,26 @@ def download_rruff_cif(
         "Download": "cif",
     }
 
+
+def _rruff_cif_links(html: str) -> List[str]:
+    cif_links: List[str] = []
+    for match in _ANCHOR_HREF_RE.finditer(html):
+        href = html_unescape(next(group for group in match.groups() if group is not None))
+        if "down=cif" in href:
+            cif_links.append(urljoin(RRUFF_BASE_URL, href))
+    return cif_links
+
+
+def download_rruff_cif(
+    mineral: MineralRecord,
+    output_dir: Path,
+    *,
+    session: Optional[requests.Session] = None,
+    sleep_seconds: float = 0.8,
+) -> DownloadResult:
+    sess = session or requests.Session()
+    payload = _rruff_search_payload(mineral)
+
     try:
         response = sess.post(RRUFF_SEARCH_URL, data=payload, timeout=30)
         response.raise_for_status()
@@ -152,15 +204,7 @@ def download_rruff_cif(
             message=f"RRUFF request failed: {exc}",
         )
 
-    soup = BeautifulSoup(response.text, "html.parser")
-    cif_links: List[str] = []
-    for anchor in soup.find_all("a"):
-        href = anchor.get("href")
-        if not href:
-            continue
-        if "down=cif" in href:
-            cif_links.append(urljoin(RRUFF_BASE_URL, href))
-
+    cif_links = _rruff_cif_links(response.text)
     if not cif_links:
         return DownloadResult(
             mineral=mineral,
@@ -206,14 +250,10 @@ def download_rruff_cif(
     )
 
 
-def download_materials_project_cif(
-    mineral: MineralRecord,
-    output_dir: Path,
-    *,
-    api_key: Optional[str] = None,
-    session: Optional[requests.Session] = None,
-    sleep_seconds: float = 0.5,
-) -> DownloadResult:
+def _materials_project_query(
+    mineral: MineralRecord, api_key: Optional[str]
+) -> DownloadResult | tuple[str, dict, dict]:
+    """Return ``(formula, headers, params)`` for the summary search, or a skip result."""
     key = api_key or os.environ.get("MAPI_KEY") or os.environ.get("MATERIALS_PROJECT_API_KEY")
     if not key:
         return DownloadResult(
@@ -240,7 +280,6 @@ def download_materials_project_cif(
             message="Unable to normalize mineral formula for Materials Project search.",
         )
 
-    sess = session or requests.Session()
     headers = {"X-API-KEY": key}
     params = {
         "formula": formula,
@@ -249,18 +288,13 @@ def download_materials_project_cif(
         "_sort_fields": "energy_per_atom",
     }
 
-    try:
-        summary_response = sess.get(
-            MATERIALS_SUMMARY_URL, params=params, headers=headers, timeout=30
-        )
-    except requests.RequestException as exc:
-        return DownloadResult(
-            mineral=mineral,
-            source="materials_project",
-            status="error",
-            message=f"Materials Project summary request failed: {exc}",
-        )
+    return formula, headers, params
+
 
+def _materials_project_result(
+    mineral: MineralRecord, output_dir: Path, formula: str, summary_response: Any
+) -> DownloadResult:
+    """Turn a Materials Project summary response (requests or httpx) into a result."""
     if summary_response.status_code == 401:
         return DownloadResult(
             mineral=mineral,
@@ -269,7 +303,7 @@ def download_materials_project_cif(
             message="Materials Project authentication failed. Check the API key.",
         )
 
-    if not summary_response.ok:
+    if summary_response.status_code >= 400:
         detail = ""
         try:
             detail = summary_response.json()
@@ -332,13 +366,11 @@ def download_materials_project_cif(
             path=target_path,
         )
 
-    try:
-        from pymatgen.core import Structure
-    except ImportError as exc:
+    if Structure is None:
         raise StructureDownloaderError(
             "pymatgen is required to serialize Materials Project structures. "
             "Install pymatgen to continue."
-        ) from exc
+        )
 
     try:
         structure = Structure.from_dict(structure_payload)
@@ -352,8 +384,6 @@ def download_materials_project_cif(
 
     cif_data = structure.to(fmt="cif")
     target_path.write_text(cif_data)
-    if sleep_seconds:
-        time.sleep(sleep_seconds)
 
     message = f"Saved CIF for {material_id}"
     if energy_pa is not None:
@@ -368,6 +398,38 @@ def download_materials_project_cif(
     )
 
 
+def download_materials_project_cif(
+    mineral: MineralRecord,
+    output_dir: Path,
+    *,
+    api_key: Optional[str] = None,
+    session: Optional[requests.Session] = None,
+    sleep_seconds: float = 0.5,
+) -> DownloadResult:
+    query = _materials_project_query(mineral, api_key)
+    if isinstance(query, DownloadResult):
+        return query
+    formula, headers, params = query
+
+    sess = session or requests.Session()
+    try:
+        summary_response = sess.get(
+            MATERIALS_SUMMARY_URL, params=params, headers=headers, timeout=30
+        )
+    except requests.RequestException as exc:
+        return DownloadResult(
+            mineral=mineral,
+            source="materials_project",
+            status="error",
+            message=f"Materials Project summary request failed: {exc}",
+        )
+
+    result = _materials_project_result(mineral, output_dir, formula, summary_response)
+    if result.status == "downloaded" and sleep_seconds:
+        time.sleep(sleep_seconds)
+    return result
+
+
 def gather_structures(
     *,
     csv_path: Path,
@@ -378,8 +440,183 @@ def gather_structures(
     include_simulated: bool = True,
     api_key: Optional[str] = None,
     sleep_seconds: float = 0.5,
+    max_workers: int = 8,
     console: Optional[Console] = None,
 ) -> List[DownloadResult]:
+    """Blocking wrapper around :func:`gather_structures_async`.
+
+    Runs the async downloader to completion with up to *max_workers* minerals in
+    flight, so both entry points share one implementation and one rate limiter. When
+    called from a running event loop (e.g. Jupyter), the downloader runs on its own
+    loop in a worker thread.
+    """
+
+    def run() -> List[DownloadResult]:
+        return asyncio.run(
+            gather_structures_async(
+                csv_path=csv_path,
+                base_dir=base_dir,
+                minerals=minerals,
+                limit=limit,
+                include_experimental=include_experimental,
+                include_simulated=include_simulated,
+                api_key=api_key,
+                sleep_seconds=sleep_seconds,
+                max_concurrency=max_workers,
+                console=console,
+            )
+        )
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return run()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(run).result()
+
+
+async def _request_async(
+    client: httpx.AsyncClient, buckets: AsyncHostBuckets, method: str, url: str, **kwargs: Any
+) -> httpx.Response:
+    """Send a throttled request, retrying ``RETRY_STATUSES`` responses with backoff."""
+    attempt = 0
+    while True:
+        await buckets.acquire(url)
+        response = await client.request(method, url, **kwargs)
+        if response.status_code not in RETRY_STATUSES or attempt >= RETRY_TOTAL:
+            return response
+        delay = RETRY_BACKOFF * 2**attempt
+        retry_after = response.headers.get("retry-after", "")
+        if retry_after.isdigit():
+            delay = max(delay, float(retry_after))
+        await response.aclose()
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+async def _download_rruff_cif_async(
+    mineral: MineralRecord,
+    output_dir: Path,
+    *,
+    client: httpx.AsyncClient,
+    buckets: AsyncHostBuckets,
+) -> DownloadResult:
+    try:
+        response = await _request_async(
+            client,
+            buckets,
+            "POST",
+            RRUFF_SEARCH_URL,
+            data=_rruff_search_payload(mineral),
+            timeout=30,
+        )
+        response.raise_for_status()
+    except httpx.HTTPError as exc:
+        return DownloadResult(
+            mineral=mineral,
+            source="rruff",
+            status="error",
+            message=f"RRUFF request failed: {exc}",
+        )
+
+    cif_links = _rruff_cif_links(response.text)
+    if not cif_links:
+        return DownloadResult(
+            mineral=mineral,
+            source="rruff",
+            status="missing",
+            message="No CIF links found in AMCSD search results.",
+        )
+
+    target_path = output_dir / f"rruff-{slugify(mineral.name)}.cif"
+    if target_path.exists():
+        return DownloadResult(
+            mineral=mineral,
+            source="rruff",
+            status="exists",
+            message="CIF already downloaded.",
+            path=target_path,
+        )
+
+    cif_url = cif_links[0]
+
+    try:
+        cif_response = await _request_async(client, buckets, "GET", cif_url, timeout=30)
+        cif_response.raise_for_status()
+    except httpx.HTTPError as exc:
+        return DownloadResult(
+            mineral=mineral,
+            source="rruff",
+            status="error",
+            message=f"Failed to fetch CIF: {exc}",
+        )
+
+    target_path.write_bytes(cif_response.content)
+    return DownloadResult(
+        mineral=mineral,
+        source="rruff",
+        status="downloaded",
+        message=f"Saved CIF from {cif_url}",
+        path=target_path,
+    )
+
+
+async def _download_materials_project_cif_async(
+    mineral: MineralRecord,
+    output_dir: Path,
+    *,
+    api_key: Optional[str],
+    client: httpx.AsyncClient,
+    buckets: AsyncHostBuckets,
+) -> DownloadResult:
+    query = _materials_project_query(mineral, api_key)
+    if isinstance(query, DownloadResult):
+        return query
+    formula, headers, params = query
+
+    try:
+        summary_response = await _request_async(
+            client,
+            buckets,
+            "GET",
+            MATERIALS_SUMMARY_URL,
+            params=params,
+            headers=headers,
+            timeout=30,
+        )
+    except httpx.HTTPError as exc:
+        return DownloadResult(
+            mineral=mineral,
+            source="materials_project",
+            status="error",
+            message=f"Materials Project summary request failed: {exc}",
+        )
+
+    # Structure parsing and CIF serialization are CPU-bound; keep them off the loop.
+    return await asyncio.to_thread(
+        _materials_project_result, mineral, output_dir, formula, summary_response
+    )
+
+
+async def gather_structures_async(
+    *,
+    csv_path: Path,
+    base_dir: Path,
+    minerals: Optional[Sequence[str]] = None,
+    limit: Optional[int] = None,
+    include_experimental: bool = True,
+    include_simulated: bool = True,
+    api_key: Optional[str] = None,
+    sleep_seconds: float = 0.5,
+    max_concurrency: int = 8,
+    console: Optional[Console] = None,
+) -> List[DownloadResult]:
+    """Download structures for the minerals in *csv_path* concurrently.
+
+    Up to *max_concurrency* minerals are processed at once, with the RRUFF and
+    Materials Project lookups for each mineral running side by side. Requests to each
+    host are spaced *sleep_seconds* apart. Results keep the order of the input records.
+    """
     console = console or Console()
     experimental_dir, simulated_dir = ensure_structure_dirs(base_dir)
 
@@ -387,29 +624,45 @@ def gather_structures(
     if not records:
         raise StructureDownloaderError("No minerals matched the provided filters.")
 
-    results: List[DownloadResult] = []
-    session = requests.Session()
-
-    for mineral in records:
-        if include_experimental:
-            result = download_rruff_cif(
-                mineral, experimental_dir, session=session, sleep_seconds=sleep_seconds
-            )
-            results.append(result)
-            console.log(f"[cyan]RRUFF[/cyan] {mineral.name}: {result.status} - {result.message}")
-
-        if include_simulated:
-            result = download_materials_project_cif(
-                mineral,
-                simulated_dir,
-                api_key=api_key,
-                session=session,
-                sleep_seconds=sleep_seconds,
-            )
-            results.append(result)
-            console.log(
-                f"[magenta]Materials Project[/magenta] {mineral.name}: "
-                f"{result.status} - {result.message}"
-            )
-
-    return results
+    semaphore = asyncio.Semaphore(max(max_concurrency, 1))
+    buckets = AsyncHostBuckets(1.0 / sleep_seconds if sleep_seconds > 0 else 0.0)
+
+    transport = httpx.AsyncHTTPTransport(retries=RETRY_TOTAL)
+    async with httpx.AsyncClient(transport=transport, follow_redirects=True) as client:
+
+        async def process(mineral: MineralRecord) -> List[DownloadResult]:
+            jobs = []
+            if include_experimental:
+                jobs.append(
+                    _download_rruff_cif_async(
+                        mineral, experimental_dir, client=client, buckets=buckets
+                    )
+                )
+            if include_simulated:
+                jobs.append(
+                    _download_materials_project_cif_async(
+                        mineral,
+                        simulated_dir,
+                        api_key=api_key,
+                        client=client,
+                        buckets=buckets,
+                    )
+                )
+            async with semaphore:
+                mineral_results = list(await asyncio.gather(*jobs))
+
+            for result in mineral_results:
+                if result.source == "rruff":
+                    console.log(
+                        f"[cyan]RRUFF[/cyan] {mineral.name}: {result.status} - {result.message}"
+                    )
+                else:
+                    console.log(
+                        f"[magenta]Materials Project[/magenta] {mineral.name}: "
+                        f"{result.status} - {result.message}"
+                    )
+            return mineral_results
+
+        per_mineral = await asyncio.gather(*(process(mineral) for mineral in records))
+
+    return [result for mineral_results in per_mineral for result in mineral_results]
@@ -3,15 +3,48 @@
 from __future__ import annotations
 
 import json
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List, Tuple
+from typing import Any, Iterable, List, Mapping, Tuple
 
 import faiss  # type: ignore
 import numpy as np
 
+try:  # Optional columnar, compressed record storage.
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - depends on the environment
+    pa = pq = None
+
+from ._compat import json_loads
 from .chunking import TextChunk
 
+RECORDS_PARQUET = "records.parquet"
+RECORDS_JSONL = "records.jsonl"
+
+# Stores larger than this use an HNSW graph (sub-linear search); smaller ones a flat
+# fp16 scalar-quantized index, which halves memory and scan bandwidth versus float32.
+HNSW_MIN_VECTORS = 10_000
+HNSW_NEIGHBORS = 32
+HNSW_EF_CONSTRUCTION = 80
+HNSW_EF_SEARCH = 64
+
+
+def build_index(embeddings: np.ndarray) -> faiss.Index:
+    """Return an inner-product index holding *embeddings* (L2-normalized float32 rows)."""
+    count, dim = embeddings.shape
+    if count > HNSW_MIN_VECTORS:
+        index = faiss.IndexHNSWFlat(dim, HNSW_NEIGHBORS, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        index.hnsw.efSearch = HNSW_EF_SEARCH
+    else:
+        index = faiss.IndexScalarQuantizer(
+            dim, faiss.ScalarQuantizer.QT_fp16, faiss.METRIC_INNER_PRODUCT
+        )
+        index.train(embeddings)
+    index.add(embeddings)
+    return index
+
 
 @dataclass
 class VectorRecord:
@@ -20,64 +53,128 @@ class VectorRecord:
     chunk_id: str
     source_id: str
     content: str
-    metadata: dict
+    metadata: Mapping[str, Any]
+
+    def to_dict(self) -> dict:
+        """Return a JSON-ready representation with metadata flattened to a dict."""
+        return {
+            "chunk_id": self.chunk_id,
+            "source_id": self.source_id,
+            "content": self.content,
+            "metadata": dict(self.metadata),
+        }
 
 
 class VectorStore:
-    """FAISS index wrapper with jsonl metadata persistence."""
+    """FAISS index wrapper with Parquet (or jsonl) record persistence."""
 
     def __init__(self, index: faiss.Index, records: List[VectorRecord]):
         self.index = index
         self.records = records
 
     @classmethod
-    def from_embeddings(cls, embeddings: np.ndarray, chunks: Iterable[TextChunk]) -> "VectorStore":
-        embeddings = embeddings.copy()
-        faiss.normalize_L2(embeddings)
-        dim = embeddings.shape[1]
-        index = faiss.IndexFlatIP(dim)
-        index.add(embeddings)
-        records = [
-            VectorRecord(
-                chunk_id=chunk.chunk_id,
-                source_id=chunk.source_id,
-                content=chunk.content,
-                metadata=chunk.metadata,
-            )
-            for chunk in chunks
-        ]
-        return cls(index=index, records=records)
+    def empty(cls, dim: int) -> "VectorStore":
+        """Return a store with no vectors, ready for :meth:`add`."""
+        return cls(index=faiss.IndexFlatIP(dim), records=[])
+
+    @classmethod
+    def from_embeddings(
+        cls, embeddings: np.ndarray, chunks: Iterable[TextChunk], *, inplace: bool = True
+    ) -> "VectorStore":
+        """Build a store from *embeddings*.
+
+        With ``inplace=True`` a C-contiguous float32 array is L2-normalized in place
+        (the caller's array is modified); pass ``inplace=False`` to keep it untouched.
+        """
+        embeddings = _normalized(embeddings, inplace)
+        return cls(index=build_index(embeddings), records=_records(chunks))
+
+    def add(
+        self, embeddings: np.ndarray, chunks: Iterable[TextChunk], *, inplace: bool = True
+    ) -> None:
+        """Append *embeddings* and their chunk records to the store.
+
+        ``inplace`` behaves as in :meth:`from_embeddings`.
+        """
+        self.index.add(_normalized(embeddings, inplace))
+        self.records.extend(_records(chunks))
+
+    def compact(self) -> None:
+        """Rebuild an incrementally filled flat index as the size-appropriate index type."""
+        if isinstance(self.index, faiss.IndexFlat) and self.index.ntotal:
+            self.index = build_index(self.index.reconstruct_n(0, self.index.ntotal))
 
     def save(self, path: Path) -> None:
         """Persist the FAISS index and metadata."""
         path.mkdir(parents=True, exist_ok=True)
 
         faiss_path = path / "index.faiss"
-        meta_path = path / "records.jsonl"
         config_path = path / "config.json"
 
         faiss.write_index(self.index, str(faiss_path))
 
-        with meta_path.open("w", encoding="utf-8") as f:
-            for record in self.records:
-                f.write(json.dumps(asdict(record), ensure_ascii=False) + "\n")
+        if pq is not None:
+            self._save_parquet(path / RECORDS_PARQUET)
+            (path / RECORDS_JSONL).unlink(missing_ok=True)
+        else:
+            with (path / RECORDS_JSONL).open("w", encoding="utf-8") as f:
+                for record in self.records:
+                    f.write(json.dumps(record.to_dict(), ensure_ascii=False) + "\n")
+            (path / RECORDS_PARQUET).unlink(missing_ok=True)
 
         config = {"size": len(self.records), "dimension": self.index.d}
         config_path.write_text(json.dumps(config, indent=2), encoding="utf-8")
 
+    def _save_parquet(self, records_path: Path) -> None:
+        table = pa.table(
+            {
+                "chunk_id": [record.chunk_id for record in self.records],
+                "source_id": [record.source_id for record in self.records],
+                "content": [record.content for record in self.records],
+                "metadata": [
+                    json.dumps(dict(record.metadata), ensure_ascii=False) for record in self.records
+                ],
+            },
+            schema=pa.schema(
+                [
+                    ("chunk_id", pa.string()),
+                    ("source_id", pa.string()),
+                    ("content", pa.string()),
+                    ("metadata", pa.string()),
+                ]
+            ),
+        )
+        pq.write_table(table, records_path, compression="zstd", compression_level=3)
+
     @classmethod
-    def load(cls, path: Path) -> "VectorStore":
-        faiss_path = path / "index.faiss"
-        meta_path = path / "records.jsonl"
+    def load(cls, path: Path, *, mmap: bool = True) -> "VectorStore":
+        """Load a saved store.
 
-        if not faiss_path.exists() or not meta_path.exists():
+        By default the index file is memory-mapped read-only, so loading is cheap and
+        the pages are shared between processes serving the same store; pass
+        ``mmap=False`` for a private in-memory copy that can be extended with :meth:`add`.
+        """
+        faiss_path = path / "index.faiss"
+        parquet_path = path / RECORDS_PARQUET
+        jsonl_path = path / RECORDS_JSONL
+        use_parquet = pq is not None and parquet_path.exists()
+
+        if not faiss_path.exists() or not (use_parquet or jsonl_path.exists()):
+            if parquet_path.exists():
+                raise FileNotFoundError(
+                    f"Vector store under {path} stores records as Parquet; install pyarrow."
+                )
             raise FileNotFoundError(f"No vector store found under {path}.")
 
-        index = faiss.read_index(str(faiss_path))
+        index = _read_index(faiss_path, mmap=mmap)
+        if use_parquet:
+            return cls(index=index, records=_load_parquet_records(parquet_path))
+
+        # One bulk read, then per-line decoding (C-accelerated with orjson).
         records = []
-        with meta_path.open("r", encoding="utf-8") as f:
-            for line in f:
-                payload = json.loads(line)
+        for line in jsonl_path.read_bytes().split(b"\n"):
+            if line.strip():
+                payload = json_loads(line)
                 records.append(
                     VectorRecord(
                         chunk_id=payload["chunk_id"],
@@ -92,15 +189,54 @@ class VectorStore:
         self, query_embeddings: np.ndarray, top_k: int
     ) -> List[List[Tuple[VectorRecord, float]]]:
         """Search the index and return records with similarity scores."""
+        query_embeddings = np.ascontiguousarray(query_embeddings, dtype=np.float32)
         faiss.normalize_L2(query_embeddings)
         scores, indices = self.index.search(query_embeddings, top_k)
-        output: List[List[Tuple[VectorRecord, float]]] = []
-        for idx_list, score_list in zip(indices, scores):
-            pair_list: List[Tuple[VectorRecord, float]] = []
-            for idx, score in zip(idx_list, score_list):
-                if idx == -1:
-                    continue
-                record = self.records[idx]
-                pair_list.append((record, float(score)))
-            output.append(pair_list)
-        return output
+        # One tolist() per array yields Python ints/floats for the whole batch, so the
+        # comprehension avoids numpy scalar indexing and per-hit float() casts.
+        records = self.records
+        return [
+            [(records[idx], score) for idx, score in zip(idx_row, score_row) if idx != -1]
+            for idx_row, score_row in zip(indices.tolist(), scores.tolist())
+        ]
+
+
+def _read_index(faiss_path: Path, *, mmap: bool) -> faiss.Index:
+    if mmap:
+        try:
+            return faiss.read_index(str(faiss_path), faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+        except RuntimeError:
+            pass  # index type or faiss build without mmap support; read normally
+    return faiss.read_index(str(faiss_path))
+
+
+def _load_parquet_records(records_path: Path) -> List[VectorRecord]:
+    table = pq.read_table(records_path)
+    columns = [table.column(name).to_pylist() for name in ("chunk_id", "source_id", "content")]
+    metadata = map(json_loads, table.column("metadata").to_pylist())
+    return [
+        VectorRecord(chunk_id=chunk_id, source_id=source_id, content=content, metadata=meta)
+        for chunk_id, source_id, content, meta in zip(*columns, metadata)
+    ]
+
+
+def _normalized(embeddings: np.ndarray, inplace: bool) -> np.ndarray:
+    if inplace:
+        # Converts (copies) only when the input is not already C-contiguous float32.
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+    else:
+        embeddings = np.array(embeddings, dtype=np.float32, order="C", copy=True)
+    faiss.normalize_L2(embeddings)
+    return embeddings
+
+
+def _records(chunks: Iterable[TextChunk]) -> List[VectorRecord]:
+    return [
+        VectorRecord(
+            chunk_id=chunk.chunk_id,
+            source_id=chunk.source_id,
+            content=chunk.content,
+            metadata=chunk.metadata,
+        )
+        for chunk in chunks
+    ]
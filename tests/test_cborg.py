@@ -0,0 +1,81 @@
+"""Tests for matching CBORG models to their API names."""
+
+from __future__ import annotations
+
+import random
+from typing import List
+
+from pyllo.cborg import CBORGModel, _build_ngram_index, _match_api_names
+
+
+def _model(creator: str, name: str) -> CBORGModel:
+    return CBORGModel(
+        endpoint="cloud",
+        creator=creator,
+        name=name,
+        context="",
+        vision="",
+        cost="",
+        security="",
+    )
+
+
+def _baseline_match(model: CBORGModel, api_map: dict[str, List[str]]) -> tuple:
+    """The original exhaustive two-way substring scan."""
+    key_candidates = {model.name.lower(), f"{model.creator} {model.name}".lower()}
+    api_names: List[str] = []
+    for key, codes in api_map.items():
+        if any(candidate in key for candidate in key_candidates) or any(
+            key in candidate for candidate in key_candidates
+        ):
+            api_names.extend(codes)
+    return tuple(sorted(set(api_names)))
+
+
+def _assert_matches_baseline(models: List[CBORGModel], api_map: dict[str, List[str]]) -> None:
+    index = _build_ngram_index(api_map)
+    for model in models:
+        assert _match_api_names(model, api_map, index) == _baseline_match(model, api_map)
+
+
+def test_partial_token_heading_is_matched() -> None:
+    api_map = {"openai gpt-4o": ["openai/gpt-4o"], "o1": ["openai/o1"]}
+    model = _model("OpenAI", "o1-preview")
+
+    assert _match_api_names(model, api_map, _build_ngram_index(api_map)) == ("openai/o1",)
+    _assert_matches_baseline([model], api_map)
+
+
+def test_matches_baseline_on_typical_headings() -> None:
+    api_map = {
+        "anthropic claude sonnet": ["anthropic/claude-sonnet"],
+        "claude": ["anthropic/claude"],
+        "openai gpt-4o": ["openai/gpt-4o"],
+        "gpt-4o mini": ["openai/gpt-4o-mini"],
+        "o1": ["openai/o1"],
+        "llama 3.1 405b": ["lbl/llama"],
+        "ai": ["misc/ai"],
+    }
+    models = [
+        _model("Anthropic", "Claude Sonnet"),
+        _model("OpenAI", "GPT-4o"),
+        _model("OpenAI", "GPT-4o Mini"),
+        _model("OpenAI", "o1-preview"),
+        _model("Meta", "Llama 3.1 405B"),
+        _model("Google", "Gemini"),
+        _model("X", "4"),
+    ]
+    _assert_matches_baseline(models, api_map)
+
+
+def test_matches_baseline_on_random_names() -> None:
+    rng = random.Random(0)
+    alphabet = "abo1- "
+
+    def word() -> str:
+        return "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 8))).strip() or "a"
+
+    for _ in range(200):
+        api_map = {word(): [f"api/{i}"] for i in range(rng.randint(1, 6))}
+        models = [_model(word(), word()) for _ in range(5)]
+        _assert_matches_baseline(models, api_map)